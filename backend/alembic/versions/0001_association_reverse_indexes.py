@@ -0,0 +1,43 @@
+# backend/alembic/versions/0001_association_reverse_indexes.py
+"""Index composites inverses sur les tables d'association.
+
+Les clés primaires (user_id, board_id), (card_id, label_id) et (user_id, card_id)
+ne servent pas les recherches qui filtrent d'abord sur l'autre colonne.
+
+Revision ID: 0001
+Revises:
+"""
+
+from alembic import op
+
+revision = "0001"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+INDEXES = (
+    ("ix_board_members_board_user", "board_members", ["board_id", "user_id"]),
+    ("ix_card_labels_label_card", "card_labels", ["label_id", "card_id"]),
+    ("ix_card_members_card_user", "card_members", ["card_id", "user_id"]),
+)
+
+
+def upgrade() -> None:
+    # CREATE INDEX CONCURRENTLY ne peut pas s'exécuter dans une transaction
+    with op.get_context().autocommit_block():
+        for name, table, columns in INDEXES:
+            op.create_index(
+                name, table, columns,
+                postgresql_concurrently=True,
+                if_not_exists=True
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, _ in INDEXES:
+            op.drop_index(
+                name, table_name=table,
+                postgresql_concurrently=True,
+                if_exists=True
+            )
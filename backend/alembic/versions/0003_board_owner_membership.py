@@ -0,0 +1,48 @@
+# backend/alembic/versions/0003_board_owner_membership.py
+"""Ligne 'owner' du propriétaire dans board_members.
+
+Chaque propriétaire (boards.owner_id) est inscrit dans board_members avec le rôle
+'owner' : les contrôles d'accès n'interrogent plus que board_members.
+Un index unique partiel garantit un seul 'owner' par tableau.
+
+Revision ID: 0003
+Revises: 0002
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+revision = "0003"
+down_revision = "0002"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Un propriétaire déjà inscrit comme collaborateur passe au rôle 'owner'
+    op.execute("""
+        INSERT INTO board_members (board_id, user_id, role)
+        SELECT id, owner_id, 'owner' FROM boards
+        ON CONFLICT (user_id, board_id) DO UPDATE SET role = 'owner'
+    """)
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "uq_board_members_owner", "board_members", ["board_id"],
+            unique=True,
+            postgresql_where=sa.text("role = 'owner'"),
+            postgresql_concurrently=True,
+            if_not_exists=True
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "uq_board_members_owner", table_name="board_members",
+            postgresql_concurrently=True,
+            if_exists=True
+        )
+    # Rôle antérieur non conservé par upgrade() : les lignes 'owner' repassent en 'admin'
+    # plutôt que d'être supprimées, pour ne pas perdre les propriétaires déjà collaborateurs
+    # (une ligne 'admin' du propriétaire ne lui donne aucun droit supplémentaire)
+    op.execute("UPDATE board_members SET role = 'admin' WHERE role = 'owner'")
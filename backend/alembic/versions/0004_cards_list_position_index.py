@@ -0,0 +1,34 @@
+# backend/alembic/versions/0004_cards_list_position_index.py
+"""Index (list_id, position) sur cards.
+
+MAX(position) d'une liste se lit en fin d'index au lieu de compter ses lignes.
+
+Revision ID: 0004
+Revises: 0003
+"""
+
+from alembic import op
+
+revision = "0004"
+down_revision = "0003"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # CREATE INDEX CONCURRENTLY ne peut pas s'exécuter dans une transaction
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_cards_list_position", "cards", ["list_id", "position"],
+            postgresql_concurrently=True,
+            if_not_exists=True
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_cards_list_position", table_name="cards",
+            postgresql_concurrently=True,
+            if_exists=True
+        )
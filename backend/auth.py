@@ -8,15 +8,88 @@ Gestion de l'authentification JWT
 
 import jwt
 import bcrypt
-from datetime import datetime, timedelta
-from typing import Optional, Dict, Any
+import hmac
+import hashlib
+import json
+import logging
+import ssl
+import threading
+import time
+from datetime import timedelta
+from typing import Optional, Dict, Any, Tuple
 from functools import wraps
 import os
 
+# Flask est optionnel : seuls login_required et get_current_user en dépendent
+try:
+    from flask import Response, g, request, jsonify
+except ImportError:
+    Response = g = request = jsonify = None
+
+# orjson est optionnel : repli sur le json standard de PyJWT
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+from argon2 import PasswordHasher
+from argon2.exceptions import InvalidHashError, VerificationError
+from cachetools import TTLCache
+
+logger = logging.getLogger(__name__)
+
 # Configuration (utiliser des variables d'environnement en production)
 SECRET_KEY = os.getenv("JWT_SECRET_KEY", "votre-clé-secrète-très-sécurisée-changez-moi-en-production")
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("JWT_EXPIRE_MINUTES", "30"))
+_DEFAULT_TTL_S = ACCESS_TOKEN_EXPIRE_MINUTES * 60
+
+# Clé secrète encodée une seule fois, et état HMAC-SHA256 (ipad/opad) précalculé
+_SECRET_BYTES = SECRET_KEY.encode('utf-8')
+_hmac_template = hmac.new(_SECRET_BYTES, digestmod="sha256")
+
+# Paramètres Argon2id : réduits par défaut en environnement de test
+ENVIRONMENT = os.getenv("ENVIRONMENT", "development")
+ARGON2_TIME_COST = int(os.getenv("ARGON2_TIME_COST", "1" if ENVIRONMENT == "testing" else "3"))
+ARGON2_MEMORY_COST = int(os.getenv("ARGON2_MEMORY_COST", "8192" if ENVIRONMENT == "testing" else "65536"))  # en KiB
+ARGON2_PARALLELISM = int(os.getenv("ARGON2_PARALLELISM", "4"))
+
+if ENVIRONMENT == "production" and (ARGON2_TIME_COST < 3 or ARGON2_MEMORY_COST < 65536):
+    raise ValueError("Argon2 doit utiliser au moins time_cost=3 et memory_cost=65536 en production")
+
+_ph = PasswordHasher(
+    time_cost=ARGON2_TIME_COST,
+    memory_cost=ARGON2_MEMORY_COST,
+    parallelism=ARGON2_PARALLELISM,
+    hash_len=32
+)
+
+# Préfixes des anciens hashes bcrypt encore présents en base
+_BCRYPT_PREFIXES = ("$2a$", "$2b$", "$2y$")
+
+# Cache des vérifications de mot de passe réussies (durée de vie en secondes)
+BCRYPT_VERIFY_CACHE_TTL = int(os.getenv("BCRYPT_VERIFY_CACHE_TTL", "30"))
+BCRYPT_VERIFY_CACHE_SIZE = int(os.getenv("BCRYPT_VERIFY_CACHE_SIZE", "10000"))
+
+_password_cache: TTLCache = TTLCache(maxsize=BCRYPT_VERIFY_CACHE_SIZE, ttl=BCRYPT_VERIFY_CACHE_TTL)
+_password_cache_lock = threading.RLock()
+
+# Cache des tokens JWT déjà vérifiés (durée de vie en secondes)
+JWT_CACHE_SIZE = int(os.getenv("JWT_CACHE_SIZE", "10000"))
+JWT_CACHE_TTL = int(os.getenv("JWT_CACHE_TTL", "5"))
+
+_jwt_cache: TTLCache = TTLCache(maxsize=JWT_CACHE_SIZE, ttl=JWT_CACHE_TTL)
+_jwt_cache_lock = threading.Lock()
+
+# Corps JSON des réponses 401 de login_required, sérialisés une seule fois
+_TOKEN_MISSING_BODY = json.dumps({
+    "error": "Token manquant",
+    "msg": "Un token d'authentification est requis"
+}).encode('utf-8')
+_TOKEN_INVALID_BODY = json.dumps({
+    "error": "Token invalide",
+    "msg": "Le token est invalide ou a expiré"
+}).encode('utf-8')
 
 # =============================================================================
 # Gestion des mots de passe
@@ -24,23 +97,59 @@ ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("JWT_EXPIRE_MINUTES", "30"))
 
 def hash_password(password: str) -> str:
     """
-    Hash un mot de passe en utilisant bcrypt.
+    Hash un mot de passe en utilisant Argon2id.
     
     Args:
         password: Le mot de passe en clair
         
     Returns:
-        Le mot de passe hashé avec le salt
+        Le mot de passe hashé (format PHC, salt inclus)
     """
-    # Génère un salt et hash le mot de passe
-    salt = bcrypt.gensalt()
-    hashed = bcrypt.hashpw(password.encode('utf-8'), salt)
-    return hashed.decode('utf-8')
+    return _ph.hash(password)
+
+def needs_rehash(hashed_password: str) -> bool:
+    """
+    Indique si un hash doit être recalculé (ancien hash bcrypt ou
+    paramètres Argon2 obsolètes). À appeler après une connexion réussie.
+    
+    Args:
+        hashed_password: Le mot de passe hashé stocké en base
+        
+    Returns:
+        True si le hash doit être remplacé par hash_password(...)
+    """
+    if hashed_password.startswith(_BCRYPT_PREFIXES):
+        return True
+    return _ph.check_needs_rehash(hashed_password)
+
+def _check_password(plain_password: str, hashed_password: str) -> bool:
+    """Vérifie le mot de passe avec Argon2id, ou bcrypt pour les anciens hashes."""
+    if hashed_password.startswith(_BCRYPT_PREFIXES):
+        return bcrypt.checkpw(
+            plain_password.encode('utf-8'),
+            hashed_password.encode('utf-8')
+        )
+    try:
+        return _ph.verify(hashed_password, plain_password)
+    except (VerificationError, InvalidHashError):
+        return False
+
+def _password_cache_key(plain: bytes, hashed: bytes) -> bytes:
+    """
+    Dérive la clé du cache de vérification via HMAC-SHA256 afin que le
+    mot de passe en clair ne soit jamais conservé en mémoire.
+    """
+    mac = _hmac_template.copy()
+    mac.update(plain + b"\0" + hashed)
+    return mac.digest()
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """
     Vérifie si un mot de passe correspond à son hash.
     
+    Les vérifications réussies sont mises en cache pendant
+    BCRYPT_VERIFY_CACHE_TTL secondes ; les échecs ne le sont jamais.
+    
     Args:
         plain_password: Le mot de passe en clair
         hashed_password: Le mot de passe hashé
@@ -48,15 +157,71 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     Returns:
         True si le mot de passe est correct, False sinon
     """
-    return bcrypt.checkpw(
-        plain_password.encode('utf-8'),
-        hashed_password.encode('utf-8')
-    )
+    plain = plain_password.encode('utf-8')
+    hashed = hashed_password.encode('utf-8')
+    key = _password_cache_key(plain, hashed)
+    
+    with _password_cache_lock:
+        if key in _password_cache:
+            return True
+    
+    # Calcul du hash hors du verrou pour ne pas sérialiser les vérifications
+    if not _check_password(plain_password, hashed_password):
+        return False
+    
+    with _password_cache_lock:
+        _password_cache[key] = True
+    return True
 
 # =============================================================================
 # Gestion des tokens JWT
 # =============================================================================
 
+def _check_hmac_backend() -> None:
+    """
+    Signale une seule fois, à l'import, si HMAC-SHA256 (HS256) ne peut pas
+    s'appuyer sur les routines EVP accélérées d'OpenSSL (SHA-NI / ARMv8 SHA).
+    """
+    if ssl.OPENSSL_VERSION_INFO < (1, 1, 1):
+        logger.warning("OpenSSL < 1.1.1 (%s) : HS256 sans accélération matérielle", ssl.OPENSSL_VERSION)
+    if getattr(hashlib.sha256, "__name__", "") != "openssl_sha256":
+        logger.warning("hashlib.sha256 n'est pas fourni par OpenSSL : HS256 non accéléré")
+
+_check_hmac_backend()
+
+class _OrjsonPyJWT(jwt.PyJWT):
+    """
+    PyJWT dont la (dé)sérialisation des claims passe par orjson.
+    Limité à l'instance utilisée par ce module : le module json global de
+    PyJWT n'est pas modifié.
+    """
+    
+    def _encode_payload(self, payload, headers=None, json_encoder=None) -> bytes:
+        if json_encoder is not None:
+            return super()._encode_payload(payload, headers, json_encoder)
+        return orjson.dumps(payload)
+    
+    def _decode_payload(self, decoded: Dict[str, Any]) -> Any:
+        try:
+            payload = orjson.loads(decoded["payload"])
+        except orjson.JSONDecodeError as e:
+            raise jwt.DecodeError(f"Invalid payload string: {e}")
+        if not isinstance(payload, dict):
+            raise jwt.DecodeError("Invalid payload string: must be a json object")
+        return payload
+
+# Instance PyJWT partagée : évite de repasser par les fonctions globales du
+# module à chaque appel et centralise l'encodage/décodage HS256.
+_jwt = _OrjsonPyJWT() if orjson is not None else jwt.PyJWT()
+
+def _jwt_encode(claims: Dict[str, Any]) -> str:
+    """Signe les claims en HS256 avec la clé secrète."""
+    return _jwt.encode(claims, _SECRET_BYTES, algorithm=ALGORITHM)
+
+def _jwt_decode(token: str) -> Dict[str, Any]:
+    """Vérifie la signature HS256 et retourne les claims (lève jwt.InvalidTokenError)."""
+    return _jwt.decode(token, _SECRET_BYTES, algorithms=[ALGORITHM])
+
 def create_access_token(
     data: Dict[str, Any],
     expires_delta: Optional[timedelta] = None
@@ -73,37 +238,56 @@ def create_access_token(
     """
     to_encode = data.copy()
     
-    # Calcul de la date d'expiration
+    # Calcul de la date d'expiration (timestamps epoch entiers, un seul appel horloge)
+    now = int(time.time())
     if expires_delta:
-        expire = datetime.utcnow() + expires_delta
+        expire = now + int(expires_delta.total_seconds())
     else:
-        expire = datetime.utcnow() + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
+        expire = now + _DEFAULT_TTL_S
     
     # Ajout de l'expiration et d'informations standard
     to_encode.update({
         "exp": expire,
-        "iat": datetime.utcnow(),
+        "iat": now,
         "type": "access"
     })
     
     # Encodage du token
-    encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
+    encoded_jwt = _jwt_encode(to_encode)
     return encoded_jwt
 
 def verify_token(token: str) -> Optional[Dict[str, Any]]:
     """
     Vérifie et décode un token JWT.
     
+    Les payloads valides sont mis en cache (clé : empreinte BLAKE2b du token)
+    jusqu'à min(exp, maintenant + JWT_CACHE_TTL).
+    
     Args:
         token: Le token JWT à vérifier
         
     Returns:
         Les données décodées si le token est valide, None sinon
     """
+    if not isinstance(token, str):
+        return None
+    key: bytes = hashlib.blake2b(token.encode('utf-8'), digest_size=16).digest()
+    now: float = time.time()
+    payload: Dict[str, Any]
+    valid_until: float
+    
+    # Token déjà vérifié récemment : on évite un nouveau calcul HMAC
+    with _jwt_cache_lock:
+        entry: Optional[Tuple[Dict[str, Any], float]] = _jwt_cache.get(key)
+    if entry is not None:
+        payload, valid_until = entry
+        if valid_until > now:
+            # Copie : le payload en cache est partagé entre les appelants
+            return dict(payload)
+    
     try:
         # Décodage et vérification du token
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        return payload
+        payload = _jwt_decode(token)
     
     except jwt.ExpiredSignatureError:
         # Le token a expiré
@@ -112,6 +296,16 @@ def verify_token(token: str) -> Optional[Dict[str, Any]]:
     except jwt.InvalidTokenError:
         # Token invalide (signature, format, etc.)
         return None
+    
+    # Seuls les tokens valides sont mis en cache, jamais au-delà de leur expiration
+    valid_until = now + JWT_CACHE_TTL
+    exp: Optional[int] = payload.get("exp")
+    if exp is not None:
+        valid_until = min(valid_until, exp)
+    with _jwt_cache_lock:
+        _jwt_cache[key] = (payload, valid_until)
+    
+    return dict(payload)
 
 def decode_token_without_verification(token: str) -> Optional[Dict[str, Any]]:
     """
@@ -144,28 +338,32 @@ def login_required(f):
         def protected_route():
             return jsonify({"msg": "Accès autorisé", "user": g.user})
     """
+    # Références résolues une fois par route décorée : la fonction interne
+    # les lit depuis la fermeture au lieu de LOAD_GLOBAL + LOAD_ATTR par requête
+    compare_digest = hmac.compare_digest
+    verify = verify_token
+    
     @wraps(f)
     def decorated_function(*args, **kwargs):
         token = None
         
         # Récupération du token depuis l'en-tête Authorization
+        # (préfixe comparé en temps constant, sans split ni liste intermédiaire)
         auth_header = request.headers.get('Authorization')
-        if auth_header and auth_header.startswith('Bearer '):
-            token = auth_header.split(' ')[1]
+        if (
+            auth_header
+            and len(auth_header) > 7
+            and compare_digest(auth_header[:7].encode('utf-8'), b"Bearer ")
+        ):
+            token = auth_header[7:]
         
         if not token:
-            return jsonify({
-                "error": "Token manquant",
-                "msg": "Un token d'authentification est requis"
-            }), 401
+            return Response(_TOKEN_MISSING_BODY, status=401, mimetype="application/json")
         
         # Vérification du token
-        payload = verify_token(token)
+        payload = verify(token)
         if not payload:
-            return jsonify({
-                "error": "Token invalide",
-                "msg": "Le token est invalide ou a expiré"
-            }), 401
+            return Response(_TOKEN_INVALID_BODY, status=401, mimetype="application/json")
         
         # Stockage des infos utilisateur dans le contexte
         g.user = payload
@@ -183,8 +381,10 @@ def get_current_user() -> Optional[Dict[str, Any]]:
     Returns:
         Les données de l'utilisateur ou None
     """
-    from flask import g
-    return getattr(g, 'user', None)
+    try:
+        return g.user
+    except AttributeError:
+        return None
 
 # =============================================================================
 # Exemples d'utilisation
@@ -195,7 +395,7 @@ Exemple d'utilisation avec Flask :
 
 from flask import Flask, request, jsonify
 from .auth import (
-    hash_password, verify_password, create_access_token,
+    hash_password, verify_password, needs_rehash, create_access_token,
     verify_token, login_required, get_current_user
 )
 
@@ -227,6 +427,9 @@ def login():
     # user = User.query.filter_by(username=username).first()
     
     # if user and verify_password(password, user.password):
+    #     if needs_rehash(user.password):
+    #         user.password = hash_password(password)
+    #         db.session.commit()
     #     token = create_access_token({"sub": user.id, "username": user.username})
     #     return jsonify({"access_token": token, "token_type": "bearer"})
     
@@ -259,12 +462,31 @@ def test_auth_functions():
     """Tests basiques des fonctions d'authentification"""
     print("🧪 Tests d'authentification...")
     
-    # Test hashage mot de passe
-    pwd = "monSuperMotDePasse123!"
-    hashed = hash_password(pwd)
-    assert verify_password(pwd, hashed), "❌ La vérification du mot de passe a échoué"
-    assert not verify_password("mauvais_mdp", hashed), "❌ La vérification ne devrait pas réussir"
-    print("✅ Hashage et vérification des mots de passe : OK")
+    # Argon2 et bcrypt relâchent le GIL : les opérations indépendantes tournent en parallèle
+    from concurrent.futures import ThreadPoolExecutor
+    
+    with ThreadPoolExecutor(max_workers=os.cpu_count()) as pool:
+        # Test hashage mot de passe
+        pwd = "monSuperMotDePasse123!"
+        hashed = hash_password(pwd)
+        ok = pool.submit(verify_password, pwd, hashed)
+        ko = pool.submit(verify_password, "mauvais_mdp", hashed)
+        assert ok.result(), "❌ La vérification du mot de passe a échoué"
+        assert not ko.result(), "❌ La vérification ne devrait pas réussir"
+        print("✅ Hashage et vérification des mots de passe : OK")
+        
+        # Test compatibilité avec les anciens hashes bcrypt
+        legacy = bcrypt.hashpw(pwd.encode('utf-8'), bcrypt.gensalt(rounds=4)).decode('utf-8')
+        assert verify_password(pwd, legacy), "❌ La vérification d'un hash bcrypt a échoué"
+        assert needs_rehash(legacy), "❌ Un hash bcrypt devrait être recalculé"
+        assert not needs_rehash(hashed), "❌ Un hash Argon2 à jour ne devrait pas être recalculé"
+        print("✅ Compatibilité bcrypt : OK")
+        
+        # Test sur un lot de mots de passe aléatoires
+        plains = [os.urandom(12).hex() for _ in range(64)]
+        hashes = list(pool.map(hash_password, plains))
+        assert all(pool.map(verify_password, plains, hashes)), "❌ Échec sur le lot de mots de passe"
+        print("✅ Lot de 64 mots de passe : OK")
     
     # Test création et vérification de token
     user_data = {"sub": "123", "username": "testuser", "role": "admin"}
@@ -4,14 +4,21 @@ Gestion centralisée de la configuration et des variables d'environnement.
 Utilise Pydantic BaseSettings pour la validation et le chargement des variables.
 """
 
+import json
 import os
-from typing import Optional, List
-from pydantic import BaseSettings, validator, AnyHttpUrl
+import sys
+from dataclasses import make_dataclass
+from functools import lru_cache
+from typing import Optional, List, Tuple
+from pydantic import AnyHttpUrl, Field, TypeAdapter, ValidationInfo, field_validator
+from pydantic_settings import BaseSettings, SettingsConfigDict
 from dotenv import load_dotenv
 
 # Chargement du fichier .env si présent
 load_dotenv()
 
+_ORIGIN_ADAPTER = TypeAdapter(AnyHttpUrl)
+
 class Settings(BaseSettings):
     """
     Configuration de l'application.
@@ -34,8 +41,9 @@ class Settings(BaseSettings):
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 60 * 24 * 8  # 8 jours
     REFRESH_TOKEN_EXPIRE_MINUTES: int = 60 * 24 * 30  # 30 jours
     
-    # CORS
-    ALLOWED_ORIGINS: List[AnyHttpUrl] = []
+    # CORS (chaîne : liste JSON ou origines séparées par des virgules ;
+    # un List[...] serait décodé en JSON par pydantic-settings avant le validateur)
+    ALLOWED_ORIGINS: str = ""
     ALLOWED_HOSTS: List[str] = ["localhost", "127.0.0.1"]
     
     # ============================================
@@ -49,7 +57,7 @@ class Settings(BaseSettings):
     POSTGRES_DB: str = "monapi_dev"
     
     # URL de connexion complète (alternative)
-    DATABASE_URL: Optional[str] = None
+    DATABASE_URL: Optional[str] = Field(None, validate_default=True)
     
     # Configuration SQLAlchemy
     SQLALCHEMY_POOL_SIZE: int = 10
@@ -65,7 +73,7 @@ class Settings(BaseSettings):
     REDIS_PASSWORD: Optional[str] = None
     REDIS_DB: int = 0
     REDIS_SSL: bool = False
-    REDIS_URL: Optional[str] = None
+    REDIS_URL: Optional[str] = Field(None, validate_default=True)
     
     # ============================================
     # JWT & AUTHENTIFICATION
@@ -139,7 +147,8 @@ class Settings(BaseSettings):
     # ============================================
     # VALIDATION
     # ============================================
-    @validator("ENVIRONMENT")
+    @field_validator("ENVIRONMENT")
+    @classmethod
     def validate_environment(cls, v):
         """Valide que l'environnement est autorisé."""
         allowed_envs = ["development", "staging", "production", "testing"]
@@ -147,31 +156,38 @@ class Settings(BaseSettings):
             raise ValueError(f"L'environnement doit être l'un des suivants: {allowed_envs}")
         return v
     
-    @validator("SECRET_KEY", pre=True)
+    @field_validator("SECRET_KEY", mode="before")
+    @classmethod
     def validate_secret_key(cls, v):
         """Vérifie que la clé secrète n'est pas la valeur par défaut en production."""
         if os.getenv("ENVIRONMENT") == "production" and v == "change-this-secret-key-in-production":
             raise ValueError("Il est impératif de définir une SECRET_KEY sécurisée en production")
         return v
     
-    @validator("DATABASE_URL", pre=True, always=True)
-    def assemble_database_url(cls, v, values):
+    @field_validator("DATABASE_URL", mode="before")
+    @classmethod
+    def assemble_database_url(cls, v, info: ValidationInfo):
         """Construit l'URL de connexion à la base de données si non fournie."""
         if isinstance(v, str) and v:
             return v
         
+        values = info.data
+        
         return (
             f"postgresql://{values.get('POSTGRES_USER')}:{values.get('POSTGRES_PASSWORD')}@"
             f"{values.get('POSTGRES_SERVER')}:{values.get('POSTGRES_PORT')}/"
             f"{values.get('POSTGRES_DB')}"
         )
     
-    @validator("REDIS_URL", pre=True, always=True)
-    def assemble_redis_url(cls, v, values):
+    @field_validator("REDIS_URL", mode="before")
+    @classmethod
+    def assemble_redis_url(cls, v, info: ValidationInfo):
         """Construit l'URL de connexion Redis si non fournie."""
         if isinstance(v, str) and v:
             return v
         
+        values = info.data
+        
         password = values.get("REDIS_PASSWORD")
         auth = f":{password}@" if password else ""
         proto = "rediss" if values.get("REDIS_SSL") else "redis"
@@ -181,50 +197,86 @@ class Settings(BaseSettings):
         
         return f"{proto}://{auth}{host}:{port}/{db}"
     
-    @validator("ALLOWED_ORIGINS", pre=True)
+    @field_validator("ALLOWED_ORIGINS", mode="before")
+    @classmethod
     def parse_allowed_origins(cls, v):
-        """Parse la liste des origines autorisées depuis une chaîne ou la retourne telle quelle."""
+        """Normalise les origines autorisées (JSON, CSV ou liste) en CSV après validation de chaque URL."""
         if isinstance(v, str):
-            if v.startswith("[") and v.endswith("]"):
-                # Parse comme liste JSON
-                import json
-                return json.loads(v)
-            elif "," in v:
-                # Parse comme liste séparée par des virgules
-                return [origin.strip() for origin in v.split(",")]
-        return v or []
+            s = v.strip()
+            # Liste JSON ou liste séparée par des virgules
+            items = json.loads(s) if s.startswith("[") else s.split(",")
+        else:
+            items = v or []
+        origins = [str(o).strip() for o in items]
+        origins = [o for o in origins if o]
+        for origin in origins:
+            _ORIGIN_ADAPTER.validate_python(origin)
+        return ",".join(origins)
+    
+    @property
+    def allowed_origins(self) -> List[str]:
+        """Liste des origines autorisées."""
+        return self.ALLOWED_ORIGINS.split(",") if self.ALLOWED_ORIGINS else []
     
     # ============================================
     # CONFIGURATION PYDANTIC
     # ============================================
-    class Config:
-        """Configuration du modèle Pydantic."""
-        env_file = ".env"
-        env_file_encoding = "utf-8"
-        case_sensitive = True  # Respecte la casse des variables d'environnement
+    model_config = SettingsConfigDict(
+        env_file=".env",
+        env_file_encoding="utf-8",
+        case_sensitive=True,  # Respecte la casse des variables d'environnement
         
         # Permet de charger des variables avec préfixe
-        env_prefix = "APP_"
+        env_prefix="APP_",
         
         # Pour les champs avec alias (ex: SECRET_KEY = Field(alias="SECRET"))
-        allow_population_by_field_name = True
+        populate_by_name=True,
+    )
 
 
 # ============================================
-# EXPORT DE L'INSTANCE
+# VERSION FIGÉE (après validation)
 # ============================================
-# Instance globale de la configuration
-settings = Settings()
+# Dataclass immuable à __slots__ générée à partir des champs de Settings :
+# l'accès aux attributs ne passe plus par un dictionnaire d'instance.
+# Les propriétés dérivées de Settings y sont figées en champs calculés une fois.
+FrozenSettings = make_dataclass(
+    "FrozenSettings",
+    [(name, field.annotation) for name, field in Settings.model_fields.items()]
+    + [("allowed_origins", Tuple[str, ...])],
+    frozen=True,
+    slots=True,
+)
+
+# Chaînes courtes comparées fréquemment : internées pour des comparaisons par identité
+_INTERNED_FIELDS = ("ENVIRONMENT", "JWT_ALGORITHM", "LOG_LEVEL", "API_V1_PREFIX")
+
+
+def _freeze(model: Settings) -> "FrozenSettings":
+    """Convertit les paramètres validés en FrozenSettings."""
+    data = model.model_dump()
+    for name in _INTERNED_FIELDS:
+        data[name] = sys.intern(data[name])
+    data["allowed_origins"] = tuple(model.allowed_origins)
+    return FrozenSettings(**data)
+
 
 # ============================================
 # UTILITAIRES
 # ============================================
-def get_settings() -> Settings:
+@lru_cache(maxsize=1)
+def get_settings() -> "FrozenSettings":
     """
-    Retourne l'instance des paramètres.
+    Retourne l'instance des paramètres (construite, validée et figée une seule fois).
     Utilisé pour l'injection de dépendances dans FastAPI.
     """
-    return settings
+    return _freeze(Settings())
+
+# ============================================
+# EXPORT DE L'INSTANCE
+# ============================================
+# Instance globale de la configuration
+settings = get_settings()
 
 # ============================================
 # EXEMPLE D'UTILISATION
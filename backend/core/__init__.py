@@ -0,0 +1,3 @@
+"""
+Package core - logique transverse (permissions, exceptions)
+"""
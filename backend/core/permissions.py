@@ -0,0 +1,248 @@
+"""
+backend/core/permissions.py
+Vérification des droits d'accès aux tableaux, listes et cartes.
+
+Les résultats sont mémorisés pour la durée de la requête dans `db.info`
+(la session SQLAlchemy est créée et fermée à chaque requête par get_db),
+ce qui évite de répéter les mêmes contrôles lorsque plusieurs vérifications
+imbriquées portent sur le même couple (tableau, utilisateur).
+"""
+
+from enum import Enum
+from functools import wraps
+from typing import Any, Callable
+
+from fastapi import HTTPException, status
+from sqlalchemy import bindparam, exists, inspect, lambda_stmt, or_, select
+from sqlalchemy.orm import Session
+from sqlalchemy.orm.base import NO_VALUE
+
+from backend.models import Board, Card, List, board_members
+
+
+class BoardPermission(str, Enum):
+    """Niveaux de permission sur un tableau."""
+    READ = "read"      # Consulter le tableau et son contenu
+    WRITE = "write"    # Modifier le contenu (listes, cartes, étiquettes)
+    ADMIN = "admin"    # Gérer le tableau et ses collaborateurs
+
+
+# Rôles (table board_members) donnant accès aux opérations d'administration
+ADMIN_ROLES = ("owner", "admin")
+
+# Messages d'erreur construits une seule fois au chargement du module
+_DETAILS = {
+    "board_not_found": "Tableau non trouvé",
+    "board_forbidden": "Vous n'avez pas accès à ce tableau",
+    "not_owner": "Seul le propriétaire peut effectuer cette action",
+    "list_not_found": "Liste non trouvée",
+    "card_not_found": "Carte non trouvée",
+}
+
+
+def _request_cache(kind: str) -> Callable:
+    """
+    Mémorise le résultat d'une vérification dans `db.info` pour la durée de la
+    session, sous la clé (kind, object_id, user_id, permission).
+    Les refus (HTTPException) ne sont jamais mémorisés.
+    """
+    def decorator(func: Callable) -> Callable:
+        @wraps(func)
+        def wrapper(
+            db: Session,
+            object_id: int,
+            user_id: int,
+            permission: BoardPermission = BoardPermission.READ
+        ) -> Any:
+            cache = db.info.setdefault("permission_cache", {})
+            key = (kind, object_id, user_id, permission.value)
+            if key not in cache:
+                cache[key] = func(db, object_id, user_id, permission)
+            return cache[key]
+        return wrapper
+    return decorator
+
+
+# Requêtes de contrôle construites une seule fois avec lambda_stmt : le SQL compilé est
+# mis en cache sous l'identité de la lambda (pas de recalcul de la clé de cache par appel).
+# Paramètres : bid (tableau), uid (utilisateur), roles (liste, rôles d'administration)
+_MEMBER_EXISTS = lambda_stmt(lambda: select(exists().where(
+    board_members.c.board_id == bindparam("bid"),
+    board_members.c.user_id == bindparam("uid")
+)))
+
+_ADMIN_MEMBER_EXISTS = lambda_stmt(lambda: select(exists().where(
+    board_members.c.board_id == bindparam("bid"),
+    board_members.c.user_id == bindparam("uid"),
+    board_members.c.role.in_(bindparam("roles", expanding=True))
+)))
+
+# La propriété se lit uniquement sur boards.owner_id (recherche par clé primaire) ; la ligne
+# 'owner' de board_members ne sert qu'aux contrôles d'appartenance et d'administration
+_OWNER_EXISTS = lambda_stmt(lambda: select(exists().where(
+    Board.id == bindparam("bid"),
+    Board.owner_id == bindparam("uid")
+)))
+
+# has_board_permission : le propriétaire a sa ligne 'owner' dans board_members, l'accès en
+# écriture ou administration est donc une seule recherche indexée (pas de OR vers boards) ;
+# seule la lecture consulte aussi boards pour les tableaux publics
+_PERMISSION_STMTS = {
+    BoardPermission.READ: lambda_stmt(lambda: select(or_(
+        exists().where(
+            board_members.c.board_id == bindparam("bid"),
+            board_members.c.user_id == bindparam("uid")
+        ),
+        exists().where(Board.id == bindparam("bid"), Board.is_public.is_(True))
+    ))),
+    BoardPermission.WRITE: _MEMBER_EXISTS,
+    BoardPermission.ADMIN: _ADMIN_MEMBER_EXISTS,
+}
+
+
+def _is_member(db: Session, board: Board, user_id: int, permission: BoardPermission) -> bool:
+    """
+    Vérifie l'appartenance au tableau par une requête EXISTS indexée
+    (clé primaire board_members), sans charger la collection board.members.
+    Si la collection est déjà chargée, le test se fait en mémoire.
+    """
+    if permission != BoardPermission.ADMIN:
+        members = inspect(board).attrs.members.loaded_value
+        if members is not NO_VALUE:
+            return any(member.id == user_id for member in members)
+    
+    if permission == BoardPermission.ADMIN:
+        return db.scalar(_ADMIN_MEMBER_EXISTS, {"bid": board.id, "uid": user_id, "roles": ADMIN_ROLES})
+    return db.scalar(_MEMBER_EXISTS, {"bid": board.id, "uid": user_id})
+
+
+@_request_cache("board")
+def check_board_access(
+    db: Session,
+    board_id: int,
+    user_id: int,
+    permission: BoardPermission = BoardPermission.READ
+) -> Board:
+    """
+    Vérifie que l'utilisateur possède la permission demandée sur un tableau.
+    
+    Returns:
+        Board: Le tableau si l'accès est autorisé
+        
+    Raises:
+        HTTPException 404: Si le tableau n'existe pas
+        HTTPException 403: Si l'utilisateur n'a pas la permission
+    """
+    # Session.get consulte d'abord l'identity map : aucun SELECT si le tableau est déjà chargé
+    board = db.get(Board, board_id)
+    if not board:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=_DETAILS["board_not_found"]
+        )
+    
+    # Le propriétaire a tous les droits
+    if board.owner_id == user_id:
+        return board
+    
+    # Un tableau public est lisible par tous
+    if board.is_public and permission == BoardPermission.READ:
+        return board
+    
+    if not _is_member(db, board, user_id, permission):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail=_DETAILS["board_forbidden"]
+        )
+    
+    return board
+
+
+@_request_cache("board_permission")
+def has_board_permission(
+    db: Session,
+    board_id: int,
+    user_id: int,
+    permission: BoardPermission = BoardPermission.READ
+) -> bool:
+    """
+    Indique si l'utilisateur possède la permission demandée sur un tableau,
+    en une seule requête EXISTS (aucune ligne Board chargée ni instrumentée).
+    À préférer à check_board_access quand l'endpoint n'a pas besoin du tableau.
+    
+    Un tableau inexistant renvoie False (pas de distinction 404 / 403).
+    """
+    params = {"bid": board_id, "uid": user_id}
+    if permission == BoardPermission.ADMIN:
+        params["roles"] = ADMIN_ROLES
+    return bool(db.scalar(_PERMISSION_STMTS[permission], params))
+
+
+def is_board_owner(db: Session, board_id: int, user_id: int) -> bool:
+    """
+    Indique si l'utilisateur est le propriétaire du tableau (requête EXISTS,
+    sans charger le tableau). Un tableau inexistant renvoie False.
+    """
+    return bool(db.scalar(_OWNER_EXISTS, {"bid": board_id, "uid": user_id}))
+
+
+def check_board_ownership(db: Session, board_id: int, user_id: int) -> Board:
+    """
+    Vérifie que l'utilisateur est le propriétaire du tableau.
+    
+    Returns:
+        Board: Le tableau si l'utilisateur en est le propriétaire
+        
+    Raises:
+        HTTPException 404: Si le tableau n'existe pas
+        HTTPException 403: Si l'utilisateur n'est pas le propriétaire
+    """
+    board = check_board_access(db, board_id, user_id, BoardPermission.READ)
+    if board.owner_id != user_id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail=_DETAILS["not_owner"]
+        )
+    return board
+
+
+@_request_cache("list")
+def check_list_access(
+    db: Session,
+    list_id: int,
+    user_id: int,
+    permission: BoardPermission = BoardPermission.READ
+) -> List:
+    """
+    Vérifie que l'utilisateur possède la permission demandée sur la liste
+    (via le tableau qui la contient).
+    """
+    db_list = db.get(List, list_id)
+    if not db_list:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=_DETAILS["list_not_found"]
+        )
+    check_board_access(db, db_list.board_id, user_id, permission)
+    return db_list
+
+
+@_request_cache("card")
+def check_card_access(
+    db: Session,
+    card_id: int,
+    user_id: int,
+    permission: BoardPermission = BoardPermission.READ
+) -> Card:
+    """
+    Vérifie que l'utilisateur possède la permission demandée sur la carte
+    (via la liste puis le tableau qui la contiennent).
+    """
+    card = db.get(Card, card_id)
+    if not card:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=_DETAILS["card_not_found"]
+        )
+    check_list_access(db, card.list_id, user_id, permission)
+    return card
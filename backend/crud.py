@@ -4,14 +4,20 @@ Opérations CRUD de base pour toutes les entités du modèle de données.
 Implémente un système générique avec SQLAlchemy async.
 """
 
-from typing import Any, Dict, Generic, List, Optional, Type, TypeVar, Union
-from datetime import datetime
+import asyncio
+import base64
+import json
+from typing import Any, Dict, Generic, List, Optional, Sequence, Type, TypeVar, Union
+from datetime import date, datetime, time
+from decimal import Decimal
+from uuid import UUID
 
-from sqlalchemy import select, update, delete, func
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, insert, update, delete, bindparam, func, inspect, literal, text, tuple_, and_, or_
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncSession
 from sqlalchemy.orm import DeclarativeMeta
+from sqlalchemy.sql.base import ExecutableOption
 
-from .database import get_async_session
+from .database import async_engine, get_async_session
 from .models.base import Base
 
 ModelType = TypeVar("ModelType", bound=DeclarativeMeta)
@@ -19,21 +25,142 @@ CreateSchemaType = TypeVar("CreateSchemaType")
 UpdateSchemaType = TypeVar("UpdateSchemaType")
 
 
+class IdLoader:
+    """
+    Regroupe les lectures par ID d'un même tour de boucle d'événements.
+    
+    Chaque load(id) retourne un Future ; les IDs demandés avant que la boucle ne
+    reprenne la main (ex: coroutines lancées par asyncio.gather) sont résolus par
+    un seul SELECT ... WHERE id IN (...) au lieu d'une requête par entité.
+    
+    Les IDs sont convertis dans le type Python de la clé primaire avant regroupement :
+    load("5") et load(5) désignent la même ligne, comme une comparaison en SQL.
+    
+    Args:
+        db: Session de base de données de la requête
+        stmt: Requête SELECT avec le paramètre lié extensible `ids`
+        key: Nom de l'attribut de clé primaire du modèle
+        python_type: Type Python de la clé primaire (None : IDs utilisés tels quels)
+    """
+    
+    def __init__(self, db: AsyncSession, stmt: Any, key: str = "id", python_type: Optional[type] = None):
+        self.db = db
+        self.stmt = stmt
+        self.key = key
+        self.python_type = python_type
+        self._pending: Dict[Any, asyncio.Future] = {}
+        self._task: Optional[asyncio.Task] = None
+    
+    def load(self, id: Any) -> asyncio.Future:
+        """Programme la lecture de `id` et retourne le Future de l'entité (None si absente)."""
+        if self.python_type is not None and not isinstance(id, self.python_type):
+            try:
+                id = self.python_type(id)
+            except (TypeError, ValueError):
+                # ID inconvertible : aucune ligne ne peut correspondre
+                future = asyncio.get_running_loop().create_future()
+                future.set_result(None)
+                return future
+        future = self._pending.get(id)
+        if future is None:
+            loop = asyncio.get_running_loop()
+            future = self._pending[id] = loop.create_future()
+            if self._task is None:
+                # La tâche ne démarre qu'au prochain tour : les autres load() du tour s'y ajoutent
+                self._task = loop.create_task(self._dispatch())
+        return future
+    
+    async def _dispatch(self) -> None:
+        """Exécute le lot en attente et résout les Futures correspondants."""
+        batch, self._pending, self._task = self._pending, {}, None
+        try:
+            result = await self.db.execute(self.stmt, {"ids": list(batch)})
+            rows = {getattr(row, self.key): row for row in result.scalars()}
+        except Exception as exc:
+            for future in batch.values():
+                if not future.done():
+                    future.set_exception(exc)
+            return
+        for id, future in batch.items():
+            if not future.done():
+                future.set_result(rows.get(id))
+
+
 class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
     """
     Classe de base pour les opérations CRUD avec des méthodes génériques.
     
+    Les relations sont chargées en lot via `load_options` pour éviter le
+    problème N+1 (une requête par ligne lors de l'accès à une relation) :
+    - selectinload pour les relations one-to-many / many-to-many
+      (une seule requête WHERE ... IN, sans multiplication des lignes)
+    - joinedload pour les relations many-to-one (une seule jointure)
+    
     Args:
         model: La classe du modèle SQLAlchemy
+        load_options: Options de chargement appliquées par défaut aux lectures multiples
     """
     
-    def __init__(self, model: Type[ModelType]):
+    def __init__(
+        self,
+        model: Type[ModelType],
+        load_options: Sequence[ExecutableOption] = ()
+    ):
         self.model = model
+        self.load_options = tuple(load_options)
+        # Colonnes du modèle indexées par nom d'attribut, résolues une seule fois
+        # (évite hasattr/getattr sur les descripteurs instrumentés à chaque requête)
+        mapper = inspect(model)
+        self._cols = {attr.key: getattr(model, attr.key) for attr in mapper.column_attrs}
+        # Clé primaire (première colonne), quel que soit le nom de son attribut
+        self._pk_key = mapper.get_property_by_column(mapper.primary_key[0]).key
+        self._pk = self._cols[self._pk_key]
+        try:
+            self._pk_type: Optional[type] = self._pk.type.python_type
+        except NotImplementedError:
+            self._pk_type = None
+        # Requêtes de lecture par clé construites une seule fois avec des paramètres
+        # liés : seule la valeur change d'un appel à l'autre et le SQL compilé est
+        # réutilisé depuis le cache de compilation du moteur
+        self._get_many_stmt = select(model).where(
+            self._pk.in_(bindparam("ids", expanding=True))
+        )
+        self._by_field_stmts: Dict[str, Any] = {}
+        self._count_stmt = select(func.count()).select_from(model)
+        self._exists_stmt = select(literal(1)).where(self._pk == bindparam("value")).limit(1)
+        self._delete_stmt = delete(model).where(self._pk == bindparam("value")).returning(model)
+    
+    def _column(self, field: str) -> Any:
+        """Retourne la colonne `field` du modèle ou lève ValueError si elle n'existe pas."""
+        col = self._cols.get(field)
+        if col is None:
+            raise ValueError(f"Le champ {field} n'existe pas sur le modèle")
+        return col
+    
+    def _apply_filters(self, query: Any, filters: Optional[Dict[str, Any]]) -> Any:
+        """Ajoute les filtres d'égalité {champ: valeur} ; les champs inconnus sont ignorés."""
+        if filters:
+            for field, value in filters.items():
+                col = self._cols.get(field)
+                if col is not None:
+                    query = query.where(col == value)
+        return query
+    
+    def _loader(self, db: AsyncSession) -> IdLoader:
+        """Retourne l'IdLoader du modèle propre à la session (donc à la requête)."""
+        loaders = db.info.setdefault("loaders", {})
+        loader = loaders.get(self.model)
+        if loader is None:
+            loader = loaders[self.model] = IdLoader(db, self._get_many_stmt, self._pk_key, self._pk_type)
+        return loader
     
     async def get(self, db: AsyncSession, id: Any) -> Optional[ModelType]:
         """
         Récupère une entité par son ID.
         
+        Les appels concurrents d'une même requête sont regroupés en un seul
+        SELECT ... WHERE id IN (...) par l'IdLoader de la session.
+        
         Args:
             db: Session de base de données
             id: ID de l'entité
@@ -41,10 +168,7 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         Returns:
             L'entité si trouvée, None sinon
         """
-        result = await db.execute(
-            select(self.model).where(self.model.id == id)
-        )
-        return result.scalar_one_or_none()
+        return await self._loader(db).load(id)
     
     async def get_multi(
         self,
@@ -53,41 +177,180 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         skip: int = 0,
         limit: int = 100,
         filters: Optional[Dict[str, Any]] = None,
-        order_by: Optional[str] = None
+        order_by: Optional[str] = None,
+        load_options: Optional[Sequence[ExecutableOption]] = None
     ) -> List[ModelType]:
         """
         Récupère plusieurs entités avec support du filtrage et du tri.
         
+        Obsolète : la pagination par OFFSET parcourt puis ignore `skip` lignes.
+        Préférer get_page (pagination par curseur).
+        
         Args:
             db: Session de base de données
             skip: Nombre d'entités à ignorer (offset)
             limit: Nombre maximum d'entités à récupérer
             filters: Dictionnaire de filtres {champ: valeur}
             order_by: Nom du champ pour le tri
+            load_options: Options de chargement des relations (ex: selectinload(User.boards)),
+                par défaut celles de l'instance
             
         Returns:
             Liste des entités
         """
         query = select(self.model)
         
+        # Chargement groupé des relations (évite le N+1)
+        options = self.load_options if load_options is None else load_options
+        if options:
+            query = query.options(*options)
+        
         # Application des filtres
-        if filters:
-            for field, value in filters.items():
-                if hasattr(self.model, field):
-                    query = query.where(getattr(self.model, field) == value)
+        query = self._apply_filters(query, filters)
         
-        # Tri
-        if order_by and hasattr(self.model, order_by.lstrip('-')):
-            field_name = order_by.lstrip('-')
-            field = getattr(self.model, field_name)
-            if order_by.startswith('-'):
-                field = field.desc()
-            query = query.order_by(field)
+        # Tri (id en second critère : même ordre que get_page, qui peut reprendre la suite)
+        field = self._cols.get(order_by.lstrip('-')) if order_by else None
+        if field is not None:
+            query = query.order_by(*self._order_clauses(field, order_by.startswith('-')))
         
         query = query.offset(skip).limit(limit)
         result = await db.execute(query)
         return list(result.scalars().all())
     
+    def _order_clauses(self, col: Any, descending: bool) -> tuple:
+        """
+        Clauses ORDER BY (colonne, id) : l'id départage les valeurs égales et les NULL
+        suivent l'ordre par défaut de PostgreSQL (en fin de tri croissant, en tête sinon).
+        """
+        pk = self._pk
+        if descending:
+            return col.desc().nulls_first(), pk.desc()
+        return col.asc().nulls_last(), pk
+    
+    @staticmethod
+    def _dump_cursor_value(value: Any) -> Any:
+        """Convertit une valeur de colonne en valeur JSON (dates en ISO 8601, Decimal/UUID en texte)."""
+        if isinstance(value, (datetime, date, time)):
+            return value.isoformat()
+        if isinstance(value, (Decimal, UUID)):
+            return str(value)
+        return value
+    
+    @staticmethod
+    def _load_cursor_value(col: Any, value: Any) -> Any:
+        """Reconstruit une valeur de curseur selon le type Python de la colonne."""
+        if value is None:
+            return None
+        try:
+            python_type = col.type.python_type
+        except NotImplementedError:
+            return value
+        if python_type in (datetime, date, time):
+            return python_type.fromisoformat(value)
+        if python_type in (Decimal, UUID):
+            return python_type(value)
+        return value
+    
+    def _encode_cursor(self, last_val: Any, last_id: Any) -> str:
+        """Encode la position (valeur de tri, id) de la dernière ligne en curseur opaque."""
+        data = {"v": self._dump_cursor_value(last_val), "id": self._dump_cursor_value(last_id)}
+        return base64.urlsafe_b64encode(json.dumps(data).encode()).decode()
+    
+    def _decode_cursor(self, cursor: str, col: Any) -> tuple:
+        """Décode un curseur produit par _encode_cursor en (valeur de tri, id) typés."""
+        try:
+            data = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+            return (
+                self._load_cursor_value(col, data["v"]),
+                self._load_cursor_value(self._pk, data["id"]),
+            )
+        except (ValueError, KeyError, TypeError) as e:
+            raise ValueError("Curseur de pagination invalide") from e
+    
+    async def get_page(
+        self,
+        db: AsyncSession,
+        *,
+        cursor: Optional[str] = None,
+        limit: int = 20,
+        order_by: str = "id",
+        filters: Optional[Dict[str, Any]] = None,
+        load_options: Optional[Sequence[ExecutableOption]] = None
+    ) -> Dict[str, Any]:
+        """
+        Récupère une page d'entités par pagination par curseur (keyset).
+        
+        La position est exprimée par (colonne de tri, id) : la base se positionne
+        directement via l'index au lieu de parcourir les lignes précédentes.
+        Pour des performances optimales, le modèle doit disposer d'un index
+        composite (colonne de tri, id). Les valeurs NULL d'une colonne nullable
+        sont placées en fin de tri croissant et en tête de tri décroissant
+        (ordre par défaut de PostgreSQL).
+        
+        Args:
+            db: Session de base de données
+            cursor: Curseur renvoyé par la page précédente (None pour la première)
+            limit: Nombre maximum d'entités à récupérer
+            order_by: Champ de tri (préfixe '-' pour un tri décroissant)
+            filters: Dictionnaire de filtres {champ: valeur}
+            load_options: Options de chargement des relations, par défaut celles de l'instance
+            
+        Returns:
+            Dictionnaire avec items, next_cursor, has_next
+        """
+        field_name = order_by.lstrip('-')
+        col = self._column(field_name)
+        descending = order_by.startswith('-')
+        pk = self._pk
+        
+        query = select(self.model)
+        
+        # Chargement groupé des relations (évite le N+1)
+        options = self.load_options if load_options is None else load_options
+        if options:
+            query = query.options(*options)
+        
+        # Application des filtres
+        query = self._apply_filters(query, filters)
+        
+        # Positionnement après la dernière ligne de la page précédente
+        if cursor:
+            last_val, last_id = self._decode_cursor(cursor, col)
+            nullable = col.property.columns[0].nullable
+            if last_val is None:
+                # Dernière ligne à NULL : la comparaison de tuples donnerait NULL,
+                # on poursuit dans le groupe NULL par id
+                after = and_(col.is_(None), pk < last_id if descending else pk > last_id)
+                if descending:
+                    # Tri décroissant : les valeurs non NULL suivent le groupe NULL
+                    after = or_(after, col.is_not(None))
+            else:
+                key, bound = tuple_(col, pk), tuple_(last_val, last_id)
+                after = key < bound if descending else key > bound
+                if nullable and not descending:
+                    # Tri croissant : le groupe NULL vient après toutes les valeurs
+                    after = or_(after, col.is_(None))
+            query = query.where(after)
+        
+        query = query.order_by(*self._order_clauses(col, descending))
+        
+        # Une ligne supplémentaire permet de savoir s'il existe une page suivante
+        result = await db.execute(query.limit(limit + 1))
+        items = list(result.scalars().all())
+        has_next = len(items) > limit
+        items = items[:limit]
+        
+        next_cursor = None
+        if has_next:
+            last = items[-1]
+            next_cursor = self._encode_cursor(getattr(last, field_name), getattr(last, self._pk_key))
+        
+        return {
+            "items": items,
+            "next_cursor": next_cursor,
+            "has_next": has_next
+        }
+    
     async def get_with_pagination(
         self,
         db: AsyncSession,
@@ -95,40 +358,118 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         page: int = 1,
         per_page: int = 20,
         filters: Optional[Dict[str, Any]] = None,
-        order_by: Optional[str] = None
+        order_by: Optional[str] = None,
+        include_total: bool = False,
+        load_options: Optional[Sequence[ExecutableOption]] = None
     ) -> Dict[str, Any]:
         """
         Récupère des entités avec informations de pagination.
         
+        Aucun COUNT(*) n'est exécuté : has_next est déduit d'une ligne
+        supplémentaire. Le total (estimé) n'est calculé que sur demande.
+        
+        Args:
+            include_total: Si True, ajoute une estimation du nombre total d'entités
+        
         Returns:
-            Dictionnaire avec items, total, page, per_page
+            Dictionnaire avec items, has_next, next_cursor, estimated_total, page, per_page
+            
+        Raises:
+            ValueError: Si order_by désigne un champ inexistant
         """
+        if order_by:
+            # Champ validé d'emblée : le curseur de la page suivante est lu sur ce champ
+            self._column(order_by.lstrip('-'))
         skip = (page - 1) * per_page
         
-        # Récupère les données
-        items = await self.get_multi(
-            db, skip=skip, limit=per_page,
-            filters=filters, order_by=order_by
+        # Récupère les données (+1 ligne pour détecter la page suivante)
+        items_query = self.get_multi(
+            db, skip=skip, limit=per_page + 1,
+            filters=filters, order_by=order_by,
+            load_options=load_options
         )
         
-        # Compte total
-        total = await self.count(db, filters=filters)
+        estimated_total = None
+        if include_total:
+            # Le total est calculé en parallèle sur une seconde connexion (Core, sans ORM) :
+            # la latence devient max(items, total) au lieu de leur somme
+            async with async_engine.connect() as conn:
+                items, estimated_total = await asyncio.gather(
+                    items_query,
+                    self.estimate_count(conn, filters=filters)
+                )
+        else:
+            items = await items_query
+        
+        has_next = len(items) > per_page
+        items = items[:per_page]
+        
+        # Curseur permettant de poursuivre avec get_page (tri déterministe requis)
+        next_cursor = None
+        if has_next and order_by:
+            field_name = order_by.lstrip('-')
+            last = items[-1]
+            next_cursor = self._encode_cursor(getattr(last, field_name), getattr(last, self._pk_key))
         
         return {
             "items": items,
-            "total": total,
+            "has_next": has_next,
+            "next_cursor": next_cursor,
+            "estimated_total": estimated_total,
             "page": page,
-            "per_page": per_page,
-            "total_pages": (total + per_page - 1) // per_page
+            "per_page": per_page
         }
     
+    async def estimate_count(
+        self,
+        db: Union[AsyncSession, AsyncConnection],
+        *,
+        filters: Optional[Dict[str, Any]] = None
+    ) -> int:
+        """
+        Estime le nombre d'entités à partir des statistiques PostgreSQL
+        (pg_class.reltuples sans filtre, sinon "Plan Rows" d'un EXPLAIN).
+        Se replie sur un COUNT(*) exact pour les autres bases.
+        Accepte une session ou une connexion Core.
+        """
+        dialect = db.dialect if isinstance(db, AsyncConnection) else db.get_bind().dialect
+        if dialect.name != "postgresql":
+            return await self.count(db, filters=filters)
+        
+        if not filters:
+            result = await db.execute(
+                text("SELECT reltuples::bigint FROM pg_class WHERE relname = :t"),
+                {"t": self.model.__tablename__}
+            )
+            estimate = result.scalar()
+            # reltuples vaut -1 tant que la table n'a pas été analysée
+            if estimate is None or estimate < 0:
+                return await self.count(db)
+            return int(estimate)
+        
+        query = self._apply_filters(select(self.model), filters)
+        
+        compiled = query.compile(
+            dialect=dialect,
+            compile_kwargs={"literal_binds": True}
+        )
+        # SQL déjà rendu avec ses valeurs : envoyé tel quel au pilote, sans repasser par
+        # text() qui interpréterait un ":nom" présent dans une valeur comme paramètre lié
+        conn = db if isinstance(db, AsyncConnection) else await db.connection()
+        result = await conn.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {compiled}")
+        plan = result.scalar()
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return int(plan[0]["Plan"]["Plan Rows"])
+    
     async def create(
         self,
         db: AsyncSession,
         *,
         obj_in: CreateSchemaType,
         created_by: Optional[str] = None,
-        commit: bool = True
+        commit: bool = True,
+        refresh: bool = False
     ) -> ModelType:
         """
         Crée une nouvelle entité.
@@ -138,6 +479,8 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
             obj_in: Données de création (Pydantic schema)
             created_by: Utilisateur qui crée l'entité (pour audit)
             commit: Si True, commit immédiatement
+            refresh: Si True, recharge l'entité après commit (valeurs par défaut
+                calculées par la base) ; l'ID est disponible sans rechargement
             
         Returns:
             L'entité créée
@@ -146,20 +489,71 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         obj_data = obj_in.model_dump(exclude_unset=True)
         
         # Ajoute les métadonnées d'audit si présentes
-        if hasattr(self.model, 'created_by') and created_by:
+        # (created_at/updated_at sont renseignés par la base : server_default/onupdate=now())
+        if 'created_by' in self._cols and created_by:
             obj_data['created_by'] = created_by
-        if hasattr(self.model, 'created_at'):
-            obj_data['created_at'] = datetime.utcnow()
         
         db_obj = self.model(**obj_data)
         db.add(db_obj)
         
         if commit:
             await db.commit()
-            await db.refresh(db_obj)
+            if refresh:
+                await db.refresh(db_obj)
         
         return db_obj
     
+    async def create_many(
+        self,
+        db: AsyncSession,
+        *,
+        objs_in: List[CreateSchemaType],
+        chunk: int = 500,
+        created_by: Optional[str] = None,
+        commit: bool = True
+    ) -> List[ModelType]:
+        """
+        Crée plusieurs entités en lot.
+        
+        Chaque paquet de `chunk` lignes est envoyé via le mode "insertmanyvalues"
+        de SQLAlchemy 2.0 (INSERT ... VALUES (...), (...) RETURNING ...) :
+        un aller-retour par paquet, sans db.add ni refresh par entité.
+        
+        Args:
+            db: Session de base de données
+            objs_in: Liste des données de création (Pydantic schemas)
+            chunk: Nombre de lignes par instruction INSERT
+            created_by: Utilisateur qui crée les entités (pour audit)
+            commit: Si True, commit une seule fois à la fin
+            
+        Returns:
+            Les entités créées, dans l'ordre de objs_in
+        """
+        if not objs_in:
+            return []
+        
+        # Métadonnées d'audit communes à toutes les lignes
+        audit: Dict[str, Any] = {}
+        if 'created_by' in self._cols and created_by:
+            audit['created_by'] = created_by
+        
+        rows = [{**obj_in.model_dump(exclude_unset=True), **audit} for obj_in in objs_in]
+        
+        created: List[ModelType] = []
+        stmt = insert(self.model).returning(self.model, sort_by_parameter_order=True)
+        for start in range(0, len(rows), chunk):
+            result = await db.scalars(
+                stmt,
+                rows[start:start + chunk],
+                execution_options={"populate_existing": True}
+            )
+            created.extend(result.all())
+        
+        if commit:
+            await db.commit()
+        
+        return created
+    
     async def update(
         self,
         db: AsyncSession,
@@ -189,10 +583,8 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
                 setattr(db_obj, field, value)
         
         # Mise à jour des métadonnées d'audit
-        if hasattr(self.model, 'updated_by') and updated_by:
+        if 'updated_by' in self._cols and updated_by:
             db_obj.updated_by = updated_by
-        if hasattr(self.model, 'updated_at'):
-            db_obj.updated_at = datetime.utcnow()
         
         if commit:
             await db.commit()
@@ -213,28 +605,24 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         Returns:
             L'entité supprimée si trouvée, None sinon
         """
-        obj = await self.get(db, id)
-        if obj:
-            await db.delete(obj)
-            if commit:
-                await db.commit()
+        # DELETE ... RETURNING : un seul aller-retour au lieu de SELECT puis DELETE
+        # (les suppressions en cascade reposent sur les ON DELETE CASCADE du schéma)
+        result = await db.scalars(self._delete_stmt, {"value": id})
+        obj = result.one_or_none()
+        if obj is not None and commit:
+            await db.commit()
         return obj
     
     async def count(
         self,
-        db: AsyncSession,
+        db: Union[AsyncSession, AsyncConnection],
         *,
         filters: Optional[Dict[str, Any]] = None
     ) -> int:
         """
         Compte le nombre d'entités correspondant aux filtres.
         """
-        query = select(func.count()).select_from(self.model)
-        
-        if filters:
-            for field, value in filters.items():
-                if hasattr(self.model, field):
-                    query = query.where(getattr(self.model, field) == value)
+        query = self._apply_filters(self._count_stmt, filters)
         
         result = await db.execute(query)
         return result.scalar() or 0
@@ -247,8 +635,9 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         """
         Vérifie si une entité existe par son ID.
         """
-        result = await self.get(db, id)
-        return result is not None
+        # SELECT 1 ... LIMIT 1 : aucune ligne complète transférée ni hydratée
+        result = await db.execute(self._exists_stmt, {"value": id})
+        return result.scalar() is not None
     
     async def get_by_field(
         self,
@@ -259,11 +648,11 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         """
         Récupère une entité par un champ spécifique (unique).
         """
-        if not hasattr(self.model, field):
-            raise ValueError(f"Le champ {field} n'existe pas sur le modèle")
-        
-        query = select(self.model).where(getattr(self.model, field) == value)
-        result = await db.execute(query)
+        query = self._by_field_stmts.get(field)
+        if query is None:
+            query = select(self.model).where(self._column(field) == bindparam("value"))
+            self._by_field_stmts[field] = query
+        result = await db.execute(query, {"value": value})
         return result.scalar_one_or_none()
 
 
@@ -274,8 +663,10 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
 # from .schemas.user import UserCreate, UserUpdate
 # 
 # class CRUDUser(CRUDBase[User, UserCreate, UserUpdate]):
+#     DEFAULT_LOADS = (selectinload(User.boards), selectinload(User.cards_assigned))
+#
 #     def __init__(self):
-#         super().__init__(User)
+#         super().__init__(User, load_options=self.DEFAULT_LOADS)
 #     
 #     # Méthodes spécifiques si nécessaire
 #     async def get_by_email(self, db: AsyncSession, email: str) -> Optional[User]:
@@ -296,9 +687,18 @@ def get_crud_instance(
     update_schema: Type[UpdateSchemaType]
 ) -> CRUDBase[ModelType, CreateSchemaType, UpdateSchemaType]:
     """
-    Factory pour créer une instance CRUD pour un modèle donné.
+    Retourne l'instance CRUD d'un modèle, créée une seule fois puis enregistrée
+    dans crud_instances (clé : nom du modèle en minuscules).
+    
+    Les colonnes et les requêtes préparées de l'instance sont calculées à
+    l'enregistrement du modèle : les appels suivants réutilisent ces objets.
+    Les schémas ne servent qu'au typage statique.
     """
-    return CRUDBase[model, create_schema, update_schema](model)
+    key = model.__name__.lower()
+    instance = crud_instances.get(key)
+    if instance is None:
+        instance = crud_instances[key] = CRUDBase(model)
+    return instance
 
 
 # Dictionnaire centralisé des instances CRUD
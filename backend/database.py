@@ -4,13 +4,21 @@ Configuration SQLAlchemy et gestion de la connexion PostgreSQL.
 Fournit le moteur, la session et la base pour les modèles SQLAlchemy.
 """
 
+import json
 import os
-from typing import Generator
+from typing import AsyncGenerator
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import Session, sessionmaker
+from starlette.requests import Request
 from urllib.parse import quote_plus
 
+try:
+    import orjson
+except ImportError:  # orjson absent : sérialisation JSON standard
+    orjson = None
+
 # --- Configuration de la base de données ---
 
 # Récupération des variables d'environnement (convention 12-factor app)
@@ -28,17 +36,81 @@ def get_database_url() -> str:
     encoded_password = quote_plus(DB_PASSWORD)
     return f"postgresql://{DB_USER}:{encoded_password}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
 
+def get_async_database_url() -> str:
+    """
+    URL de connexion PostgreSQL pour le pilote asynchrone asyncpg.
+    """
+    return get_database_url().replace("postgresql://", "postgresql+asyncpg://", 1)
+
 # --- Création du moteur SQLAlchemy ---
 
+# Options lues une seule fois au chargement du module
+SQL_ECHO = os.getenv("SQLALCHEMY_ECHO", "false").lower() == "true"
+# Recyclage des connexions avant le délai d'inactivité du serveur / load balancer
+POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+# SELECT 1 de vérification à chaque emprunt : une connexion coupée (redémarrage de la base,
+# failover) est remplacée avant d'être rendue à l'appelant (DB_POOL_PRE_PING=false pour le
+# désactiver ; les keepalives TCP et le recyclage restent actifs)
+POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "true").lower() == "true"
+# Pools dimensionnés par processus (chaque worker ASGI a les siens). Moteur synchrone
+# (read_engine partage son pool) : 25 connexions permanentes + 25 en débordement couvrent
+# le threadpool (40 threads) des endpoints synchrones. Moteur asynchrone : pool distinct,
+# 10 + 10 suffisent aux endpoints async qui rendent la main pendant les E/S.
+# Le total (DB_POOL_SIZE + DB_MAX_OVERFLOW + DB_ASYNC_POOL_SIZE + DB_ASYNC_MAX_OVERFLOW),
+# multiplié par le nombre de workers, doit rester sous max_connections
+POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "25"))
+MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "25"))
+ASYNC_POOL_SIZE = int(os.getenv("DB_ASYNC_POOL_SIZE", "10"))
+ASYNC_MAX_OVERFLOW = int(os.getenv("DB_ASYNC_MAX_OVERFLOW", "10"))
+# Taille du cache de compilation SQL (requêtes compilées réutilisées)
+QUERY_CACHE_SIZE = 1200
+
+if orjson is not None:
+    def json_serializer(obj) -> str:
+        return orjson.dumps(obj).decode()
+    json_deserializer = orjson.loads
+else:
+    json_serializer = json.dumps
+    json_deserializer = json.loads
+
+ENGINE_OPTIONS = dict(
+    pool_pre_ping=POOL_PRE_PING,
+    pool_recycle=POOL_RECYCLE,
+    query_cache_size=QUERY_CACHE_SIZE,
+    # INSERT en lot (executemany) : lignes regroupées par pages de taille fixe
+    insertmanyvalues_page_size=1000,
+    json_serializer=json_serializer,
+    json_deserializer=json_deserializer,
+    # Affiche les requêtes SQL en console (utile pour le développement)
+    echo=SQL_ECHO,
+)
+
 engine = create_engine(
     get_database_url(),
-    # Vérifie la connexion avant chaque requête (évite les erreurs de connexion inactives)
-    pool_pre_ping=True,
-    # Taille du pool de connexions
-    pool_size=10,
-    max_overflow=20,
-    # Affiche les requêtes SQL en console (utile pour le développement)
-    echo=os.getenv("SQLALCHEMY_ECHO", "false").lower() == "true"
+    # LIFO : réutilise la connexion la plus récente, les connexions inactives restent chaudes
+    pool_use_lifo=True,
+    # psycopg2 : INSERT groupés en VALUES multiples (insertmanyvalues) et
+    # UPDATE / DELETE en lot via execute_batch, au lieu d'un aller-retour par ligne
+    executemany_mode="values_plus_batch",
+    executemany_batch_page_size=500,
+    # Keepalives TCP (libpq) : détectent aussi les connexions inactives coupées par le réseau
+    connect_args={"keepalives": 1, "keepalives_idle": 30, "keepalives_interval": 10},
+    pool_size=POOL_SIZE,
+    max_overflow=MAX_OVERFLOW,
+    **ENGINE_OPTIONS
+)
+
+# Variante en autocommit pour les requêtes en lecture seule (pas de BEGIN/COMMIT)
+read_engine = engine.execution_options(isolation_level="AUTOCOMMIT")
+
+# Moteur asynchrone : les E/S base de données rendent la main à la boucle d'événements
+async_engine = create_async_engine(
+    get_async_database_url(),
+    # Caches de requêtes préparées côté asyncpg
+    connect_args={"statement_cache_size": 200, "prepared_statement_cache_size": 200},
+    pool_size=ASYNC_POOL_SIZE,
+    max_overflow=ASYNC_MAX_OVERFLOW,
+    **ENGINE_OPTIONS
 )
 
 # --- Configuration de la session ---
@@ -51,27 +123,51 @@ SessionLocal = sessionmaker(
     class_=Session
 )
 
+# Factory de sessions asynchrones (utilisée par CRUDBase et les endpoints async)
+AsyncSessionLocal = async_sessionmaker(
+    async_engine,
+    class_=AsyncSession,
+    expire_on_commit=False,  # Les objets restent utilisables après commit sans nouveau SELECT
+    autoflush=False
+)
+
 # Base pour les modèles SQLAlchemy
 Base = declarative_base()
 
 # --- Gestion des dépendances ---
 
-def get_db() -> Generator[Session, None, None]:
+# Méthodes HTTP servies par une session en autocommit
+READ_ONLY_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+
+def get_db(request: Request) -> Session:
     """
-    Dépendance FastAPI pour obtenir une session de base de données.
-    Gère automatiquement l'ouverture et la fermeture de la session.
+    Dépendance FastAPI pour obtenir la session de base de données de la requête.
+    La session est créée au premier appel puis partagée par toutes les dépendances
+    de la requête ; DBSessionMiddleware la ferme en fin de requête.
     Usage : db: Session = Depends(get_db)
     """
-    db = SessionLocal()
-    try:
-        yield db
-    except Exception as e:
-        # En cas d'erreur, rollback pour garantir l'intégrité des données
-        db.rollback()
-        raise e
-    finally:
-        # Ferme la session dans tous les cas
-        db.close()
+    db = getattr(request.state, "db", None)
+    if db is None:
+        if request.method in READ_ONLY_METHODS:
+            db = SessionLocal(bind=read_engine)
+        else:
+            db = SessionLocal()
+        request.state.db = db
+    return db
+
+async def get_async_session() -> AsyncGenerator[AsyncSession, None]:
+    """
+    Dépendance FastAPI pour obtenir une session asynchrone de base de données.
+    Les requêtes n'occupent pas la boucle d'événements pendant les E/S.
+    Usage : db: AsyncSession = Depends(get_async_session)
+    """
+    async with AsyncSessionLocal() as db:
+        try:
+            yield db
+        except Exception:
+            # En cas d'erreur, rollback pour garantir l'intégrité des données
+            await db.rollback()
+            raise
 
 def init_db() -> None:
     """
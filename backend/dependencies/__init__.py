@@ -0,0 +1,3 @@
+"""
+Package dependencies - dépendances FastAPI partagées par les routers
+"""
@@ -0,0 +1,181 @@
+"""
+backend/dependencies/auth.py
+Dépendances FastAPI d'authentification : utilisateur courant à partir du token JWT.
+
+Le couple (token, utilisateur) est mis en cache jusqu'à l'expiration du token
+(au plus AUTH_CACHE_TTL secondes) : les requêtes successives d'un même client
+évitent la vérification JWT et la lecture de l'utilisateur en base.
+Les requêtes simultanées d'un même token ne chargent l'utilisateur qu'une fois
+(protection contre l'effet dogpile), et invalidate_user() purge le cache après
+une modification du profil.
+"""
+
+import os
+import threading
+import time
+from dataclasses import dataclass
+from typing import NamedTuple, Optional
+
+from cachetools import TTLCache
+from fastapi import Depends, HTTPException, status
+from fastapi.security import OAuth2PasswordBearer
+from sqlalchemy import bindparam, select
+from sqlalchemy.orm import Session
+
+from backend.auth import ACCESS_TOKEN_EXPIRE_MINUTES, verify_token
+from backend.database import get_db
+from backend.models import User
+
+oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/login")
+
+# Cache des utilisateurs authentifiés (durée de vie en secondes)
+AUTH_CACHE_SIZE = int(os.getenv("AUTH_CACHE_SIZE", "10000"))
+AUTH_CACHE_TTL = int(os.getenv("AUTH_CACHE_TTL", "60"))
+
+
+@dataclass(frozen=True, slots=True)
+class AuthUser:
+    """
+    Vue allégée de l'utilisateur authentifié (colonnes lues par les dépendances).
+    Les endpoints qui ont besoin de l'entité User complète la rechargent via son id.
+    """
+    id: int
+    username: str
+    email: str
+    full_name: Optional[str]
+    is_active: bool
+
+
+class CachedAuth(NamedTuple):
+    """Utilisateur authentifié et date d'expiration (epoch) du token associé."""
+    user: AuthUser
+    exp: float
+
+
+# Requête construite une seule fois : le SQL compilé est réutilisé à chaque requête
+_AUTH_USER_STMT = select(
+    User.id, User.username, User.email, User.full_name, User.is_active
+).where(User.id == bindparam("user_id"))
+
+
+_AUTH_CACHE: TTLCache = TTLCache(maxsize=AUTH_CACHE_SIZE, ttl=AUTH_CACHE_TTL)
+
+# get_current_user est synchrone (exécutée dans le threadpool) : TTLCache n'est pas thread-safe
+_AUTH_CACHE_LOCK = threading.RLock()
+
+# Un verrou par token en cours de chargement : un seul thread interroge la base.
+# {token: [verrou, nombre de threads qui le détiennent ou l'attendent]} ; l'entrée n'est
+# retirée qu'au départ du dernier, sinon un nouvel arrivant créerait un second verrou
+_LOAD_LOCKS: dict = {}
+
+# Tokens révoqués (déconnexion), conservés jusqu'à leur expiration naturelle
+_REVOKED_TOKENS: TTLCache = TTLCache(maxsize=AUTH_CACHE_SIZE, ttl=ACCESS_TOKEN_EXPIRE_MINUTES * 60)
+
+_CREDENTIALS_EXCEPTION = HTTPException(
+    status_code=status.HTTP_401_UNAUTHORIZED,
+    detail="Token invalide ou expiré",
+    headers={"WWW-Authenticate": "Bearer"},
+)
+
+
+def revoke_token(token: str) -> None:
+    """Invalide un token (ex: à la déconnexion) et le retire du cache."""
+    with _AUTH_CACHE_LOCK:
+        _REVOKED_TOKENS[token] = True
+        _AUTH_CACHE.pop(token, None)
+
+
+def invalidate_user(user_id: int) -> None:
+    """
+    Retire du cache toutes les entrées d'un utilisateur.
+    À appeler après une modification du profil, du mot de passe ou du statut
+    (ex: PUT /users/me) : la requête suivante relit l'utilisateur en base.
+    """
+    with _AUTH_CACHE_LOCK:
+        for token, entry in list(_AUTH_CACHE.items()):
+            if entry.user.id == user_id:
+                _AUTH_CACHE.pop(token, None)
+
+
+def _cached_user(token: str) -> Optional[AuthUser]:
+    """Utilisateur en cache pour ce token, si son token n'a pas expiré."""
+    with _AUTH_CACHE_LOCK:
+        hit = _AUTH_CACHE.get(token)
+    if hit is not None and hit.exp > time.time():
+        return hit.user
+    return None
+
+
+def _load_user(token: str, db: Session) -> AuthUser:
+    """Vérifie le token, lit l'utilisateur en base et le met en cache."""
+    payload = verify_token(token)
+    if payload is None or payload.get("sub") is None:
+        raise _CREDENTIALS_EXCEPTION
+    
+    try:
+        user_id = int(payload["sub"])
+    except (TypeError, ValueError):
+        raise _CREDENTIALS_EXCEPTION
+    
+    row = db.execute(_AUTH_USER_STMT, {"user_id": user_id}).one_or_none()
+    if row is None:
+        raise _CREDENTIALS_EXCEPTION
+    
+    user = AuthUser(*row)
+    with _AUTH_CACHE_LOCK:
+        _AUTH_CACHE[token] = CachedAuth(user=user, exp=payload.get("exp", time.time() + AUTH_CACHE_TTL))
+    return user
+
+
+def get_current_user(
+    token: str = Depends(oauth2_scheme),
+    db: Session = Depends(get_db)
+) -> AuthUser:
+    """
+    Retourne l'utilisateur correspondant au token Bearer de la requête.
+    
+    Raises:
+        HTTPException 401: Si le token est invalide, expiré, révoqué
+            ou si l'utilisateur n'existe plus
+    """
+    with _AUTH_CACHE_LOCK:
+        revoked = token in _REVOKED_TOKENS
+    if revoked:
+        raise _CREDENTIALS_EXCEPTION
+    
+    user = _cached_user(token)
+    if user is not None:
+        return user
+    
+    with _AUTH_CACHE_LOCK:
+        entry = _LOAD_LOCKS.get(token)
+        if entry is None:
+            entry = _LOAD_LOCKS[token] = [threading.Lock(), 0]
+        entry[1] += 1
+    try:
+        with entry[0]:
+            # Un autre thread a pu charger l'utilisateur pendant l'attente du verrou
+            user = _cached_user(token)
+            if user is not None:
+                return user
+            return _load_user(token, db)
+    finally:
+        with _AUTH_CACHE_LOCK:
+            entry[1] -= 1
+            if not entry[1]:
+                del _LOAD_LOCKS[token]
+
+
+def get_current_active_user(current_user: AuthUser = Depends(get_current_user)) -> AuthUser:
+    """
+    Retourne l'utilisateur courant s'il est actif.
+    
+    Raises:
+        HTTPException 400: Si le compte est désactivé
+    """
+    if not current_user.is_active:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Utilisateur inactif"
+        )
+    return current_user
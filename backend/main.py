@@ -2,14 +2,21 @@
 Point d'entrée principal de l'API FastAPI
 Configure CORS, middlewares et monte les routers
 """
+import hashlib
+import mimetypes
 import os
+from email.utils import formatdate
 from pathlib import Path
-from fastapi import FastAPI, status
-from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from typing import Optional
+import orjson
+from fastapi import FastAPI, HTTPException, Request, Response, status
+from fastapi.responses import ORJSONResponse
 from fastapi.staticfiles import StaticFiles
 import uvicorn
 
+from backend.middleware.cors import ConditionalCORSMiddleware
+from backend.middleware.db_session import DBSessionMiddleware
+
 # Import des routers
 from backend.routers import boards, cards, labels, lists, users
 
@@ -17,26 +24,39 @@ from backend.routers import boards, cards, labels, lists, users
 app = FastAPI(
     title="API Kanban Board",
     description="API REST avec FastAPI pour gestion de tableaux Kanban",
-    version="1.0.0"
+    version="1.0.0",
+    # Sérialisation des réponses JSON par orjson (extension native)
+    default_response_class=ORJSONResponse
 )
 
-# Configuration CORS
-ORIGINS = [
+# Configuration CORS : origines exactes (pas de "*", incompatible avec allow_credentials)
+ORIGINS = frozenset({
     "http://localhost:3000",
     "http://127.0.0.1:3000",
     "http://localhost:5173",
     "http://127.0.0.1:5173",
-    "*",  # En production, limitez aux domaines spécifiques
-]
+    *filter(None, (o.strip() for o in os.getenv("CORS_ORIGINS", "").split(","))),
+})
+
+# Sous-domaines autorisés en production, ex: ^https://([a-z0-9-]+\.)?example\.com$
+ORIGIN_REGEX = os.getenv("CORS_ORIGIN_REGEX") or None
 
 app.add_middleware(
-    CORSMiddleware,
-    allow_origins=ORIGINS,
+    ConditionalCORSMiddleware,
+    allow_origins=list(ORIGINS),
+    allow_origin_regex=ORIGIN_REGEX,
     allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+    # Listes explicites (pas de "*") et preflight mis en cache 24 h par le navigateur
+    allow_methods=["GET", "POST", "PUT", "PATCH", "DELETE", "OPTIONS"],
+    allow_headers=["Authorization", "Content-Type"],
+    # En-têtes de réponse lisibles par le frontend (curseur de pagination des étiquettes)
+    expose_headers=["X-Next-Cursor"],
+    max_age=86400,
 )
 
+# Session de base de données unique par requête, fermée en fin de requête
+app.add_middleware(DBSessionMiddleware)
+
 # Montage des routers
 app.include_router(
     users.router,
@@ -68,36 +88,154 @@ app.include_router(
     tags=["Labels"]
 )
 
-# Servir les fichiers statiques du frontend en production
-dist_path = Path(__file__).parent.parent / "dist"
-if dist_path.exists():
-    app.mount("/assets", StaticFiles(directory=str(dist_path / "assets")), name="assets")
-    app.mount("/", StaticFiles(directory=str(dist_path), html=True), name="frontend")
-
 # Endpoints de base
+# Réponses constantes : corps JSON sérialisés une seule fois au chargement
+ROOT_BODY = orjson.dumps({
+    "message": "Bienvenue sur l'API Kanban Board",
+    "docs": "/docs",
+    "redoc": "/redoc"
+})
+HEALTH_BODY = orjson.dumps({"status": "healthy", "api": "running"})
+
 @app.get("/api", tags=["Root"])
 async def read_root():
     """Endpoint racine - vérifie que l'API fonctionne"""
-    return {
-        "message": "Bienvenue sur l'API Kanban Board",
-        "docs": "/docs",
-        "redoc": "/redoc"
-    }
+    return Response(content=ROOT_BODY, media_type="application/json")
 
 @app.get("/api/health", tags=["Health"])
 async def health_check():
     """Endpoint de health check pour monitoring"""
-    return JSONResponse(
-        status_code=status.HTTP_200_OK,
-        content={"status": "healthy", "api": "running"}
-    )
+    # Nouvel objet Response à chaque appel : les middlewares peuvent en modifier les en-têtes
+    return Response(content=HEALTH_BODY, media_type="application/json")
+
+# Servir les fichiers statiques du frontend en production
+dist_path = Path(__file__).parent.parent / "dist"
+
+# Les bundles Vite sont hashés (nom de fichier = contenu) : cache navigateur d'un an
+ASSET_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+
+# Fichiers du frontend (hors assets) servis depuis la mémoire en dessous de cette taille
+SMALL_FILE_MAX_SIZE = 64 * 1024
+
+
+def load_assets(directory: Path, cache_control: str = ASSET_CACHE_CONTROL, max_size: Optional[int] = None) -> dict:
+    """
+    Charge en mémoire les fichiers d'un répertoire du build au démarrage
+    (tous, ou ceux de moins de max_size octets).
+    Retourne {chemin relatif: (contenu, en-têtes)} avec ETag et type MIME précalculés.
+    """
+    assets = {}
+    for file in directory.rglob("*"):
+        if not file.is_file() or (max_size is not None and file.stat().st_size > max_size):
+            continue
+        content = file.read_bytes()
+        assets[file.relative_to(directory).as_posix()] = (content, {
+            "Cache-Control": cache_control,
+            "ETag": f'"{hashlib.blake2b(content, digest_size=16).hexdigest()}"',
+            "Content-Type": mimetypes.guess_type(file.name)[0] or "application/octet-stream",
+        })
+    return assets
+
+
+class FrontendFiles(StaticFiles):
+    """
+    StaticFiles du frontend, indexé une seule fois au démarrage (le build est immuable) :
+    - chemins réservés à l'API non résolus par un router : 404 JSON direct
+    - petits fichiers (favicon, robots.txt...) : servis depuis la mémoire
+    - chemins absents du build : 404 sans appel système
+    """
+    RESERVED_PREFIXES = ("/api/", "/docs", "/redoc", "/openapi.json")
+
+    def __init__(self, *, directory: str, **kwargs):
+        super().__init__(directory=directory, **kwargs)
+        root = Path(directory)
+        self.known_paths = frozenset(
+            "/" + file.relative_to(root).as_posix() for file in root.rglob("*") if file.is_file()
+        )
+        self.small_files = {
+            "/" + path: entry
+            for path, entry in load_assets(root, "no-cache", SMALL_FILE_MAX_SIZE).items()
+            if not path.startswith("assets/")  # déjà servis par la route /assets
+        }
+
+    async def __call__(self, scope, receive, send) -> None:
+        path = scope["path"]
+        small_file = self.small_files.get(path)
+        if small_file is not None:
+            content, headers = small_file
+            await Response(content=content, headers=headers)(scope, receive, send)
+            return
+        if (
+            path.startswith(self.RESERVED_PREFIXES)
+            or (path not in self.known_paths
+                and path.rstrip("/") + "/index.html" not in self.known_paths)
+        ):
+            response = ORJSONResponse({"detail": "Not Found"}, status_code=status.HTTP_404_NOT_FOUND)
+            await response(scope, receive, send)
+            return
+        await super().__call__(scope, receive, send)
+
+
+if dist_path.exists():
+    ASSETS = load_assets(dist_path / "assets")
+
+    # Déclarée avant le montage de "/" qui intercepterait /assets
+    @app.get("/assets/{path:path}", include_in_schema=False)
+    async def serve_asset(path: str, request: Request):
+        """Sert un asset depuis la mémoire (304 si l'ETag du client correspond)"""
+        asset = ASSETS.get(path)
+        if asset is None:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND)
+        content, headers = asset
+        if request.headers.get("if-none-match") == headers["ETag"]:
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+        return Response(content=content, headers=headers)
+
+    # index.html n'est pas hashé : revalidation systématique via ETag (no-cache)
+    index_file = dist_path / "index.html"
+    if index_file.is_file():
+        INDEX_HTML = index_file.read_bytes()
+        INDEX_HEADERS = {
+            "Cache-Control": "no-cache",
+            "ETag": f'"{hashlib.blake2b(INDEX_HTML, digest_size=16).hexdigest()}"',
+            "Last-Modified": formatdate(index_file.stat().st_mtime, usegmt=True),
+            "Content-Type": "text/html; charset=utf-8",
+        }
+
+        @app.get("/", include_in_schema=False)
+        async def serve_index(request: Request):
+            """Sert index.html depuis la mémoire (304 si l'ETag du client correspond)"""
+            if request.headers.get("if-none-match") == INDEX_HEADERS["ETag"]:
+                return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=INDEX_HEADERS)
+            return Response(content=INDEX_HTML, headers=INDEX_HEADERS)
+
+    # Monté en dernier : les routes de l'API déclarées plus haut restent prioritaires
+    app.mount("/", FrontendFiles(directory=str(dist_path), html=True), name="frontend")
 
 # Configuration pour lancer le serveur directement
 if __name__ == "__main__":
+    # Déploiement HTTP/2 (flux multiplexés sur une seule connexion) : uvicorn ne gère
+    # que HTTP/1.1, SERVER=hypercorn remplace le processus par hypercorn
+    if os.getenv("SERVER", "uvicorn") == "hypercorn":
+        os.execvp("hypercorn", [
+            "hypercorn", "backend.main:app",
+            "--bind", f"0.0.0.0:{os.getenv('PORT', 8000)}",
+            "--worker-class", "uvloop",
+            "--workers", os.getenv("WORKERS", "1"),
+            "--keep-alive", "75",
+        ])
+
+    # Rechargement automatique (surveillance des fichiers) uniquement en développement
+    reload = os.getenv("RELOAD", "false").lower() == "true"
     uvicorn.run(
-        "main:app",
+        "backend.main:app",
         host="0.0.0.0",
         port=int(os.getenv("PORT", 8000)),
-        reload=True,
+        reload=reload,
+        workers=None if reload else int(os.getenv("WORKERS", 1)),
+        loop="uvloop",
+        http="httptools",
+        backlog=4096,
         log_level="info"
     )
@@ -7,33 +7,99 @@ dans l'en-tête Authorization avant d'autoriser l'accès aux routes protégées.
 """
 
 from typing import Optional, Tuple
-from jose import JWTError, jwt
+from cachetools import TTLCache
+import jwt
 from fastapi import Request, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from starlette.types import ASGIApp, Receive, Scope, Send
+import hashlib
+import json
+import logging
 import os
-from datetime import datetime
+import ssl
+import time
+
+logger = logging.getLogger(__name__)
 
 # Configuration JWT - À adapter selon votre setup
 SECRET_KEY = os.getenv("JWT_SECRET_KEY", "votre-clé-secrète-super-sécurisée")
 ALGORITHM = os.getenv("JWT_ALGORITHM", "HS256")
 
+# Paramètres de décodage calculés une seule fois (pas de liste ni d'encodage par appel)
+_KEY = SECRET_KEY.encode()
+_ALGS = (ALGORITHM,)
+
+# Décodeur PyJWT unique : HS256 passe par hmac/hashlib, donc par les routines EVP d'OpenSSL
+_jwt = jwt.PyJWT()
+
+
+# Cache des payloads déjà vérifiés (durée de vie en secondes)
+JWT_CACHE_SIZE = int(os.getenv("JWT_CACHE_SIZE", "4096"))
+JWT_CACHE_TTL = int(os.getenv("JWT_CACHE_TTL", "30"))
+
+# Accédé uniquement depuis la boucle d'événements (middleware et dépendance async) : pas de verrou
+_token_cache: TTLCache = TTLCache(maxsize=JWT_CACHE_SIZE, ttl=JWT_CACHE_TTL)
 
-def verify_token(token: str) -> Optional[dict]:
+
+def _make_verify_token():
+    """
+    Construit verify_token avec ses dépendances liées en variables de fermeture
+    (LOAD_DEREF) plutôt que relues dans les globales du module à chaque appel.
     """
-    Vérifie et décode un token JWT.
+    decode = _jwt.decode
+    invalid_token_error = jwt.InvalidTokenError
+    blake2b = hashlib.blake2b
+    now = time.time
+    cache = _token_cache
+    key_bytes = _KEY
+    algorithms = _ALGS
     
-    Args:
-        token: Le token JWT à vérifier
+    def verify_token(token: str) -> Optional[dict]:
+        """
+        Vérifie et décode un token JWT.
         
-    Returns:
-        dict: Les données du payload si le token est valide
-        None: Si le token est invalide ou expiré
-    """
-    try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        return payload
-    except JWTError:
-        return None
+        Les payloads valides sont mis en cache (clé : empreinte BLAKE2b du token) :
+        un token déjà vérifié n'est ni re-décodé ni re-signé tant qu'il n'a pas expiré.
+        
+        Args:
+            token: Le token JWT à vérifier
+            
+        Returns:
+            dict: Les données du payload si le token est valide
+            None: Si le token est invalide ou expiré
+        """
+        key = blake2b(token.encode(), digest_size=16).digest()
+        entry: Optional[Tuple[dict, float]] = cache.get(key)
+        if entry is not None:
+            payload, exp = entry
+            if exp > now():
+                # Copie : le payload en cache ne doit pas être modifié via request.state
+                return dict(payload)
+        
+        try:
+            payload = decode(token, key_bytes, algorithms=algorithms)
+        except invalid_token_error:
+            return None
+        
+        # Sans claim exp, l'entrée n'est valable que pour la durée de vie du cache
+        cache[key] = (payload, payload.get("exp", float("inf")))
+        return dict(payload)
+    
+    return verify_token
+
+
+verify_token = _make_verify_token()
+
+
+def _encode_401(detail: str) -> Tuple[bytes, bytes]:
+    """Corps JSON d'une réponse 401 et sa longueur, encodés une seule fois."""
+    body = json.dumps({"detail": detail}).encode()
+    return body, str(len(body)).encode()
+
+
+# Réponses 401 du middleware, sérialisées au chargement du module
+_MISSING_TOKEN_401 = _encode_401("Token d'authentification manquant ou invalide")
+_INVALID_TOKEN_401 = _encode_401("Token invalide ou expiré")
 
 
 class AuthMiddleware:
@@ -44,53 +110,94 @@ class AuthMiddleware:
         app.add_middleware(AuthMiddleware)
     """
     
-    # Routes publiques qui ne nécessitent pas d'authentification
-    PUBLIC_PATHS = [
+    # Routes publiques qui ne nécessitent pas d'authentification (préfixes)
+    PUBLIC_PATHS = (
         "/docs",
         "/redoc",
         "/openapi.json",
         "/api/v1/auth/login",
         "/api/v1/auth/register",
         "/health",
-    ]
+    )
     
-    def __init__(self, app):
+    def __init__(self, app: ASGIApp):
         self.app = app
+        # Vérifié une fois au démarrage : HS256 doit s'appuyer sur OpenSSL (SHA-NI / ARMv8 SHA)
+        if getattr(hashlib.sha256, "__name__", "") == "openssl_sha256":
+            logger.info("HS256 via %s", ssl.OPENSSL_VERSION)
+        else:
+            logger.warning("hashlib.sha256 n'est pas fourni par OpenSSL : HS256 non accéléré")
+    
+    @staticmethod
+    async def _unauthorized(send: Send, response: Tuple[bytes, bytes]) -> None:
+        """Envoie directement une réponse 401 pré-encodée (sans objet Response)."""
+        body, content_length = response
+        # Liste d'en-têtes neuve : un middleware englobant (ex: CORS) peut la modifier sur place
+        await send({
+            "type": "http.response.start",
+            "status": 401,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", content_length),
+                (b"www-authenticate", b"Bearer"),
+            ],
+        })
+        await send({"type": "http.response.body", "body": body})
     
-    async def __call__(self, request: Request, call_next):
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        # Middleware ASGI pur : pas de Request ni de tâche supplémentaire par requête
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
         # Vérifier si le chemin est public
-        if any(request.url.path.startswith(path) for path in self.PUBLIC_PATHS):
-            return await call_next(request)
+        path = scope["path"]
+        # str.startswith accepte un tuple : une seule boucle en C sur les préfixes
+        if path.startswith(self.PUBLIC_PATHS):
+            await self.app(scope, receive, send)
+            return
         
-        # Extraire le token de l'en-tête Authorization
-        auth_header = request.headers.get("Authorization")
+        # Extraire le token de l'en-tête Authorization (octets bruts, un seul parcours)
+        # en repérant au passage les preflights CORS, qui ne portent jamais de token
+        auth_header = None
+        preflight = False
+        for name, value in scope["headers"]:
+            if name == b"authorization":
+                auth_header = value
+                break
+            if name == b"access-control-request-method":
+                preflight = True
         
-        if not auth_header or not auth_header.startswith("Bearer "):
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Token d'authentification manquant ou invalide",
-                headers={"WWW-Authenticate": "Bearer"},
-            )
+        if preflight and scope["method"] == "OPTIONS":
+            await self.app(scope, receive, send)
+            return
+        
+        # Schéma insensible à la casse ; le token est le reste de l'en-tête
+        if not auth_header or auth_header[:7].lower() != b"bearer ":
+            await self._unauthorized(send, _MISSING_TOKEN_401)
+            return
         
-        token = auth_header.replace("Bearer ", "")
+        try:
+            token = auth_header[7:].decode("ascii")
+        except UnicodeDecodeError:
+            await self._unauthorized(send, _MISSING_TOKEN_401)
+            return
         
         # Vérifier le token
         payload = verify_token(token)
         if payload is None:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Token invalide ou expiré",
-                headers={"WWW-Authenticate": "Bearer"},
-            )
+            await self._unauthorized(send, _INVALID_TOKEN_401)
+            return
         
-        # Ajouter les informations de l'utilisateur à la requête
-        request.state.user = payload
-        request.state.user_id = payload.get("sub")
+        # Ajouter les informations de l'utilisateur à la requête (lues via request.state)
+        state = scope.setdefault("state", {})
+        state["user"] = payload
+        state["user_id"] = payload.get("sub")
         
         # Log pour le débogage (optionnel)
-        # print(f"Utilisateur authentifié: {request.state.user_id}")
+        # print(f"Utilisateur authentifié: {state['user_id']}")
         
-        return await call_next(request)
+        await self.app(scope, receive, send)
 
 
 # Alternative: Dépendance FastAPI pour une protection plus granulaire
@@ -138,6 +245,10 @@ def get_current_user(request: Request) -> Optional[dict]:
     """
     Récupère les informations de l'utilisateur authentifié depuis la requête.
     
+    Lu directement dans scope["state"], où AuthMiddleware le dépose (un accès
+    dict, sans passer par State.__getattr__). Utilisable comme dépendance
+    (Depends(get_current_user)) : FastAPI le met alors en cache pour la requête.
+    
     Args:
         request: La requête FastAPI
         
@@ -145,12 +256,13 @@ def get_current_user(request: Request) -> Optional[dict]:
         dict: Les informations de l'utilisateur si authentifié
         None: Si aucun utilisateur n'est authentifié
     """
-    return getattr(request.state, "user", None)
+    return request.scope.get("state", {}).get("user")
 
 
 def get_current_user_id(request: Request) -> Optional[str]:
     """
-    Récupère l'ID de l'utilisateur authentifié depuis la requête.
+    Récupère l'ID de l'utilisateur authentifié depuis la requête
+    (scope["state"], voir get_current_user).
     
     Args:
         request: La requête FastAPI
@@ -159,13 +271,13 @@ def get_current_user_id(request: Request) -> Optional[str]:
         str: L'ID de l'utilisateur si authentifié
         None: Si aucun utilisateur n'est authentifié
     """
-    return getattr(request.state, "user_id", None)
+    return request.scope.get("state", {}).get("user_id")
 ```
 
 ### ⚙️ Installation des dépendances requises
 
 ```bash
-pip install python-jose[cryptography] fastapi
+pip install pyjwt fastapi
 ```
 
 ### 📝 Utilisation recommandée
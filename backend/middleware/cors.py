@@ -0,0 +1,38 @@
+# backend/middleware/cors.py
+"""
+Middleware CORS conditionnel.
+
+Les requêtes sans en-tête Origin (health checks, appels serveur à serveur,
+chargement same-origin), les fichiers du frontend et les routes exemptées sont
+transmis directement à l'application, sans passer par le traitement de CORSMiddleware.
+"""
+
+from fastapi.middleware.cors import CORSMiddleware
+from starlette.types import Receive, Scope, Send
+
+# Seules les routes de l'API sont appelées en cross-origin (le frontend est servi en same-origin)
+CORS_PATH_PREFIX = "/api/"
+
+# Routes de l'API jamais appelées en cross-origin
+CORS_EXEMPT_PATHS = frozenset({"/api/health"})
+
+
+class ConditionalCORSMiddleware(CORSMiddleware):
+    """
+    CORSMiddleware appliqué uniquement aux requêtes HTTP de l'API portant un en-tête Origin.
+    
+    Exemple d'utilisation dans main.py:
+        app.add_middleware(ConditionalCORSMiddleware, allow_origins=[...])
+    """
+    
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if (
+            scope["type"] != "http"
+            or not scope["path"].startswith(CORS_PATH_PREFIX)
+            or scope["path"] in CORS_EXEMPT_PATHS
+            # En-têtes ASGI : noms en minuscules (bytes), parcourus sans construire de Headers
+            or not any(name == b"origin" for name, _ in scope["headers"])
+        ):
+            await self.app(scope, receive, send)
+            return
+        await super().__call__(scope, receive, send)
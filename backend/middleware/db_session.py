@@ -0,0 +1,37 @@
+# backend/middleware/db_session.py
+"""
+Middleware de session de base de données à portée de requête.
+
+Une seule Session SQLAlchemy est partagée par toutes les dépendances d'une requête.
+Elle est créée paresseusement par get_db au premier besoin (aucune session pour les
+routes qui n'accèdent pas à la base) et fermée par ce middleware en fin de requête.
+"""
+
+from starlette.concurrency import run_in_threadpool
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+
+class DBSessionMiddleware:
+    """
+    Ferme la session ouverte pendant la requête, quelle que soit l'issue.
+    Middleware ASGI pur : le corps des réponses (ex: FileResponse) n'est pas ré-encapsulé.
+    
+    Exemple d'utilisation dans main.py:
+        app.add_middleware(DBSessionMiddleware)
+    """
+    
+    def __init__(self, app: ASGIApp):
+        self.app = app
+    
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            # request.state.db est stocké dans scope["state"]
+            db = scope.get("state", {}).get("db")
+            if db is not None:
+                # close() rend la connexion au pool (E/S bloquantes) : hors de la boucle d'événements
+                await run_in_threadpool(db.close)
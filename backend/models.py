@@ -1,19 +1,31 @@
 # backend/models.py
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Table, Boolean
-from sqlalchemy.sql import func
+from sqlalchemy import Column, Integer, String, Text, DateTime, FetchedValue, ForeignKey, Index, Table, Boolean
+from sqlalchemy.sql import func, text
 from sqlalchemy.orm import relationship, Mapped, mapped_column
 from sqlalchemy.ext.declarative import declarative_base
 from typing import List, Optional
 
 Base = declarative_base()
 
+# updated_at est maintenu par le trigger set_updated_at (migration 0002) : les UPDATE
+# de l'ORM n'envoient plus la colonne, la valeur est relue si on y accède ensuite.
+
+# Les collections volumineuses sont déclarées lazy="raise_on_sql" : tout chargement
+# implicite lève une erreur au lieu d'émettre un SELECT silencieux (N+1), elles se
+# chargent explicitement (selectinload / joinedload). passive_deletes=True laisse les
+# ON DELETE CASCADE de la base supprimer les lignes sans charger la collection.
+
 # Table d'association pour la relation Many-to-Many entre User et Board (collaborateurs)
 board_members = Table(
     'board_members',
     Base.metadata,
     Column('user_id', Integer, ForeignKey('users.id', ondelete='CASCADE'), primary_key=True),
     Column('board_id', Integer, ForeignKey('boards.id', ondelete='CASCADE'), primary_key=True),
-    Column('role', String(20), default='member', nullable=False)  # 'owner', 'admin', 'member'
+    Column('role', String(20), default='member', nullable=False),  # 'owner', 'admin', 'member'
+    # La clé primaire commence par user_id : index inverse pour les recherches par tableau
+    Index('ix_board_members_board_user', 'board_id', 'user_id'),
+    # Le propriétaire (boards.owner_id) a aussi sa ligne 'owner', unique par tableau
+    Index('uq_board_members_owner', 'board_id', unique=True, postgresql_where=text("role = 'owner'"))
 )
 
 # Table d'association pour la relation Many-to-Many entre Card et Label
@@ -21,7 +33,8 @@ card_labels = Table(
     'card_labels',
     Base.metadata,
     Column('card_id', Integer, ForeignKey('cards.id', ondelete='CASCADE'), primary_key=True),
-    Column('label_id', Integer, ForeignKey('labels.id', ondelete='CASCADE'), primary_key=True)
+    Column('label_id', Integer, ForeignKey('labels.id', ondelete='CASCADE'), primary_key=True),
+    Index('ix_card_labels_label_card', 'label_id', 'card_id')
 )
 
 # Table d'association pour la relation Many-to-Many entre User et Card (assignation)
@@ -29,7 +42,8 @@ card_members = Table(
     'card_members',
     Base.metadata,
     Column('user_id', Integer, ForeignKey('users.id', ondelete='CASCADE'), primary_key=True),
-    Column('card_id', Integer, ForeignKey('cards.id', ondelete='CASCADE'), primary_key=True)
+    Column('card_id', Integer, ForeignKey('cards.id', ondelete='CASCADE'), primary_key=True),
+    Index('ix_card_members_card_user', 'card_id', 'user_id')
 )
 
 
@@ -44,7 +58,7 @@ class User(Base):
     avatar_url: Mapped[Optional[str]] = mapped_column(String(255))
     is_active: Mapped[bool] = mapped_column(Boolean, default=True, nullable=False)
     created_at: Mapped[DateTime] = mapped_column(DateTime(timezone=True), server_default=func.now())
-    updated_at: Mapped[DateTime] = mapped_column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+    updated_at: Mapped[DateTime] = mapped_column(DateTime(timezone=True), server_default=func.now(), server_onupdate=FetchedValue())
     
     # Relations
     boards_owned: Mapped[List["Board"]] = relationship(
@@ -56,7 +70,9 @@ class User(Base):
     boards: Mapped[List["Board"]] = relationship(
         "Board", 
         secondary=board_members, 
-        back_populates="members"
+        back_populates="members",
+        lazy="raise_on_sql",
+        passive_deletes=True
     )
     cards_created: Mapped[List["Card"]] = relationship(
         "Card", 
@@ -66,7 +82,9 @@ class User(Base):
     cards_assigned: Mapped[List["Card"]] = relationship(
         "Card", 
         secondary=card_members, 
-        back_populates="members"
+        back_populates="members",
+        lazy="raise_on_sql",
+        passive_deletes=True
     )
     comments: Mapped[List["Comment"]] = relationship(
         "Comment", 
@@ -84,7 +102,7 @@ class Board(Base):
     is_public: Mapped[bool] = mapped_column(Boolean, default=False, nullable=False)
     background_color: Mapped[str] = mapped_column(String(7), default="#FFFFFF", nullable=False)  # Hex color
     created_at: Mapped[DateTime] = mapped_column(DateTime(timezone=True), server_default=func.now())
-    updated_at: Mapped[DateTime] = mapped_column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+    updated_at: Mapped[DateTime] = mapped_column(DateTime(timezone=True), server_default=func.now(), server_onupdate=FetchedValue())
     
     # Clés étrangères
     owner_id: Mapped[int] = mapped_column(Integer, ForeignKey('users.id'), nullable=False)
@@ -98,17 +116,22 @@ class Board(Base):
     members: Mapped[List["User"]] = relationship(
         "User", 
         secondary=board_members, 
-        back_populates="boards"
+        back_populates="boards",
+        lazy="raise_on_sql",
+        passive_deletes=True
     )
     lists: Mapped[List["List"]] = relationship(
         "List", 
         back_populates="board", 
-        cascade="all, delete-orphan"
+        cascade="all, delete-orphan",
+        passive_deletes=True
     )
     labels: Mapped[List["Label"]] = relationship(
         "Label", 
         back_populates="board", 
-        cascade="all, delete-orphan"
+        cascade="all, delete-orphan",
+        lazy="raise_on_sql",
+        passive_deletes=True
     )
 
 
@@ -119,7 +142,7 @@ class List(Base):
     name: Mapped[str] = mapped_column(String(100), nullable=False)
     position: Mapped[int] = mapped_column(Integer, default=0, nullable=False)  # Ordre dans le board
     created_at: Mapped[DateTime] = mapped_column(DateTime(timezone=True), server_default=func.now())
-    updated_at: Mapped[DateTime] = mapped_column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+    updated_at: Mapped[DateTime] = mapped_column(DateTime(timezone=True), server_default=func.now(), server_onupdate=FetchedValue())
     
     # Clés étrangères
     board_id: Mapped[int] = mapped_column(Integer, ForeignKey('boards.id', ondelete='CASCADE'), nullable=False)
@@ -129,12 +152,17 @@ class List(Base):
     cards: Mapped[List["Card"]] = relationship(
         "Card", 
         back_populates="list", 
-        cascade="all, delete-orphan"
+        cascade="all, delete-orphan",
+        passive_deletes=True
     )
 
 
 class Card(Base):
     __tablename__ = 'cards'
+    __table_args__ = (
+        # Position de fin de liste (MAX) et tri des cartes d'une liste par parcours d'index
+        Index('ix_cards_list_position', 'list_id', 'position'),
+    )
     
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
     title: Mapped[str] = mapped_column(String(200), nullable=False)
@@ -143,7 +171,7 @@ class Card(Base):
     due_date: Mapped[Optional[DateTime]] = mapped_column(DateTime(timezone=True))
     is_archived: Mapped[bool] = mapped_column(Boolean, default=False, nullable=False)
     created_at: Mapped[DateTime] = mapped_column(DateTime(timezone=True), server_default=func.now())
-    updated_at: Mapped[DateTime] = mapped_column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+    updated_at: Mapped[DateTime] = mapped_column(DateTime(timezone=True), server_default=func.now(), server_onupdate=FetchedValue())
     
     # Clés étrangères
     list_id: Mapped[int] = mapped_column(Integer, ForeignKey('lists.id', ondelete='CASCADE'), nullable=False)
@@ -159,17 +187,22 @@ class Card(Base):
     members: Mapped[List["User"]] = relationship(
         "User", 
         secondary=card_members, 
-        back_populates="cards_assigned"
+        back_populates="cards_assigned",
+        lazy="raise_on_sql",
+        passive_deletes=True
     )
     labels: Mapped[List["Label"]] = relationship(
         "Label", 
         secondary=card_labels, 
-        back_populates="cards"
+        back_populates="cards",
+        lazy="raise_on_sql",
+        passive_deletes=True
     )
     comments: Mapped[List["Comment"]] = relationship(
         "Comment", 
         back_populates="card",
-        cascade="all, delete-orphan"
+        cascade="all, delete-orphan",
+        passive_deletes=True
     )
 
 
@@ -199,7 +232,7 @@ class Comment(Base):
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
     content: Mapped[str] = mapped_column(Text, nullable=False)
     created_at: Mapped[DateTime] = mapped_column(DateTime(timezone=True), server_default=func.now())
-    updated_at: Mapped[DateTime] = mapped_column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+    updated_at: Mapped[DateTime] = mapped_column(DateTime(timezone=True), server_default=func.now(), server_onupdate=FetchedValue())
     
     # Clés étrangères
     card_id: Mapped[int] = mapped_column(Integer, ForeignKey('cards.id', ondelete='CASCADE'), nullable=False)
@@ -4,11 +4,15 @@ Endpoints API pour les opérations CRUD sur les tableaux et la gestion de la col
 """
 
 from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+from fastapi.responses import StreamingResponse
+from pydantic import TypeAdapter
+from sqlalchemy import delete, exists, insert, select, union
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session, joinedload, selectinload
 from sqlalchemy.exc import IntegrityError
 
-from backend.database import get_db
+from backend.database import SessionLocal, get_db
 from backend.models.user import User
 from backend.models.board import Board, BoardMember
 from backend.schemas.board import (
@@ -19,15 +23,99 @@ from backend.schemas.board import (
     CollaboratorOut,
     CollaboratorUpdate
 )
+from backend.schemas import CollaboratorBulkAdd
 from backend.dependencies.auth import get_current_active_user
 from backend.core.permissions import (
     check_board_access,
     check_board_ownership,
+    has_board_permission,
+    is_board_owner,
     BoardPermission
 )
 
 router = APIRouter(prefix="/boards", tags=["boards"])
 
+# Adaptateurs construits une seule fois pour les réponses en liste : validation et
+# sérialisation JSON directes par pydantic-core (response_model reste pour la doc)
+_BOARDS_ADAPTER = TypeAdapter(List[BoardOut])
+_COLLABORATORS_ADAPTER = TypeAdapter(List[CollaboratorOut])
+
+# Relations sérialisées par BoardOut, chargées d'avance sur tout chemin qui renvoie un
+# tableau (les collections sont en raise_on_sql : aucun chargement paresseux possible)
+_BOARD_OUT_OPTIONS = (
+    joinedload(Board.owner),
+    selectinload(Board.members),
+    selectinload(Board.lists),
+    selectinload(Board.labels),
+)
+
+
+def _json_list(adapter: TypeAdapter, rows) -> Response:
+    """Réponse JSON d'une liste d'objets ORM ou de lignes, sans l'encodeur de FastAPI."""
+    items = adapter.validate_python(rows, from_attributes=True)
+    return Response(content=adapter.dump_json(items), media_type="application/json")
+
+
+def get_board_or_404(db: Session, board_id: int) -> Board:
+    """
+    Charge un tableau avec les relations de BoardOut (_BOARD_OUT_OPTIONS) : pas de
+    chargement paresseux à la sérialisation. populate_existing applique les options
+    même si le tableau est déjà dans l'identity map (ex: après check_board_access).
+    
+    Raises:
+        HTTPException 404: Si le tableau n'existe pas
+    """
+    stmt = (
+        select(Board)
+        .where(Board.id == board_id)
+        .options(*_BOARD_OUT_OPTIONS)
+        .execution_options(populate_existing=True)
+    )
+    board = db.scalars(stmt).first()
+    if board is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Tableau non trouvé"
+        )
+    return board
+
+
+def _require_owner(db: Session, board_id: int, user_id: int) -> None:
+    """Refuse l'accès (403) si l'utilisateur n'est pas le propriétaire du tableau."""
+    if not is_board_owner(db, board_id, user_id):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Seul le propriétaire peut effectuer cette action"
+        )
+
+
+def _assignable_role(role) -> str:
+    """
+    Rôle à écrire dans board_members pour un collaborateur. Le rôle 'owner' est
+    refusé (400) : la propriété d'un tableau n'est portée que par boards.owner_id.
+    """
+    value = getattr(role, "value", role)
+    if value == "owner":
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Le rôle de propriétaire ne peut pas être attribué"
+        )
+    return value
+
+
+def _protect_owner_row(collaborator: BoardMember, current_user_id: int, detail: str) -> None:
+    """Refuse (400) toute modification de la ligne du propriétaire dans board_members."""
+    if collaborator.user_id == current_user_id or collaborator.role == "owner":
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=detail)
+
+
+def _user_board_ids(user_id: int):
+    """Identifiants des tableaux créés ou partagés, dédoublonnés par UNION côté base."""
+    return union(
+        select(Board.id).where(Board.owner_id == user_id),
+        select(BoardMember.board_id).where(BoardMember.user_id == user_id)
+    )
+
 
 @router.get("/", response_model=List[BoardOut])
 def get_user_boards(
@@ -39,22 +127,49 @@ def get_user_boards(
     """
     Récupère la liste des tableaux auxquels l'utilisateur a accès (créés ou partagés).
     """
-    # Tableaux créés par l'utilisateur
-    owned_boards = db.query(Board).filter(Board.owner_id == current_user.id).offset(skip).limit(limit).all()
-    
-    # Tableaux partagés avec l'utilisateur
-    shared_boards = (
-        db.query(Board)
-        .join(BoardMember)
-        .filter(BoardMember.user_id == current_user.id)
+    # Tableaux créés ou partagés en une seule requête : les identifiants sont
+    # dédoublonnés par UNION côté base (pas de DISTINCT sur les lignes complètes),
+    # la pagination porte sur l'ensemble fusionné (tri par id pour des pages stables)
+    board_ids = _user_board_ids(current_user.id)
+    stmt = (
+        select(Board)
+        .where(Board.id.in_(board_ids))
+        .order_by(Board.id)
         .offset(skip)
         .limit(limit)
-        .all()
+        .options(*_BOARD_OUT_OPTIONS)
     )
+    return _json_list(_BOARDS_ADAPTER, db.execute(stmt).scalars().all())
+
+
+@router.get("/export", response_class=StreamingResponse)
+def export_user_boards(
+    current_user: User = Depends(get_current_active_user)
+):
+    """
+    Exporte tous les tableaux de l'utilisateur (créés ou partagés) en JSON Lines,
+    un tableau par ligne, sans les charger tous en mémoire.
+    """
+    stmt = (
+        select(Board)
+        .where(Board.id.in_(_user_board_ids(current_user.id)))
+        .order_by(Board.id)
+        # Relations de BoardOut chargées par paquet de yield_per (selectinload est compatible
+        # avec yield_per, joinedload ne porte que sur la relation plusieurs-à-un owner)
+        .options(*_BOARD_OUT_OPTIONS)
+        .execution_options(stream_results=True, yield_per=500)
+    )
+    
+    def generate():
+        # Session dédiée hors autocommit : le curseur serveur (psycopg2) exige une
+        # transaction, ce que n'offre pas la session en lecture seule de get_db
+        with SessionLocal() as export_db:
+            for board in export_db.scalars(stmt):
+                yield BoardOut.model_validate(board).model_dump_json().encode() + b"\n"
+                # Détaché après sérialisation : l'identity map ne retient pas les tableaux exportés
+                export_db.expunge(board)
     
-    # Fusionner et dedupliquer les résultats
-    all_boards = {board.id: board for board in owned_boards + shared_boards}
-    return list(all_boards.values())
+    return StreamingResponse(generate(), media_type="application/x-ndjson")
 
 
 @router.post("/", response_model=BoardOut, status_code=status.HTTP_201_CREATED)
@@ -66,16 +181,20 @@ def create_board(
     """
     Crée un nouveau tableau. L'utilisateur actuel devient le propriétaire.
     """
-    new_board = Board(
-        **board_data.dict(),
-        owner_id=current_user.id
-    )
+    # INSERT ... RETURNING : le tableau revient hydraté (id, valeurs par défaut serveur)
+    # sans SELECT de rafraîchissement
+    stmt = insert(Board).values(**board_data.model_dump(), owner_id=current_user.id).returning(Board)
     
     try:
-        db.add(new_board)
+        new_board = db.execute(stmt).scalar_one()
+        # Le propriétaire figure aussi dans board_members (rôle "owner") : les contrôles
+        # d'accès se réduisent à une recherche indexée dans board_members
+        db.execute(insert(BoardMember).values(board_id=new_board.id, user_id=current_user.id, role="owner"))
+        # Relations de BoardOut chargées dans la même transaction, puis sérialisation
+        # avant le commit, qui expire les attributs de l'objet
+        response = BoardOut.model_validate(get_board_or_404(db, new_board.id))
         db.commit()
-        db.refresh(new_board)
-        return new_board
+        return response
     except IntegrityError:
         db.rollback()
         raise HTTPException(
@@ -93,8 +212,9 @@ def get_board(
     """
     Récupère les détails d'un tableau spécifique si l'utilisateur y a accès.
     """
-    board = check_board_access(db, board_id, current_user.id, BoardPermission.READ)
-    return board
+    # Contrôle d'accès d'abord : les relations ne sont chargées que pour un utilisateur autorisé
+    check_board_access(db, board_id, current_user.id, BoardPermission.READ)
+    return get_board_or_404(db, board_id)
 
 
 @router.put("/{board_id}", response_model=BoardOut)
@@ -115,8 +235,7 @@ def update_board(
     
     try:
         db.commit()
-        db.refresh(board)
-        return board
+        return get_board_or_404(db, board_id)
     except IntegrityError:
         db.rollback()
         raise HTTPException(
@@ -134,10 +253,12 @@ def delete_board(
     """
     Supprime un tableau et toutes ses données associées. Seul le propriétaire peut supprimer.
     """
-    board = check_board_ownership(db, board_id, current_user.id)
+    _require_owner(db, board_id, current_user.id)
     
+    # DELETE unique sans charger le tableau : listes, cartes, commentaires, étiquettes
+    # et membres sont supprimés par les ON DELETE CASCADE de la base
     try:
-        db.delete(board)
+        db.execute(delete(Board).where(Board.id == board_id))
         db.commit()
     except IntegrityError:
         db.rollback()
@@ -150,6 +271,22 @@ def delete_board(
 # ==================== ENDPOINTS DE COLLABORATION ====================
 
 
+def _get_collaborator(db: Session, board_id: int, user_id: int) -> BoardMember:
+    """Récupère la ligne BoardMember d'un collaborateur en une requête (404 si absente)."""
+    collaborator = db.scalars(
+        select(BoardMember).where(
+            BoardMember.board_id == board_id,
+            BoardMember.user_id == user_id
+        )
+    ).first()
+    if not collaborator:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Collaborateur non trouvé"
+        )
+    return collaborator
+
+
 @router.get("/{board_id}/collaborators", response_model=List[CollaboratorOut])
 def get_board_collaborators(
     board_id: int,
@@ -159,26 +296,28 @@ def get_board_collaborators(
     """
     Récupère la liste des collaborateurs d'un tableau. Accessible par le propriétaire et les collaborateurs.
     """
-    check_board_access(db, board_id, current_user.id, BoardPermission.READ)
+    # Le tableau lui-même n'est pas utilisé : simple EXISTS
+    if not has_board_permission(db, board_id, current_user.id, BoardPermission.READ):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Vous n'avez pas accès à ce tableau"
+        )
     
-    collaborators = (
-        db.query(BoardMember, User)
+    # Colonnes de CollaboratorOut sélectionnées directement (pas d'entités ORM hydratées) ;
+    # les lignes sont validées par attributs sans construction manuelle
+    stmt = (
+        select(
+            BoardMember.id,
+            User.id.label("user_id"),
+            User.username,
+            User.email,
+            BoardMember.role,
+            BoardMember.joined_at
+        )
         .join(User, BoardMember.user_id == User.id)
-        .filter(BoardMember.board_id == board_id)
-        .all()
+        .where(BoardMember.board_id == board_id)
     )
-    
-    return [
-        CollaboratorOut(
-            id=member.id,
-            user_id=user.id,
-            username=user.username,
-            email=user.email,
-            role=member.role,
-            joined_at=member.joined_at
-        )
-        for member, user in collaborators
-    ]
+    return _json_list(_COLLABORATORS_ADAPTER, db.execute(stmt).all())
 
 
 @router.post("/{board_id}/collaborators", response_model=CollaboratorOut)
@@ -191,15 +330,29 @@ def add_collaborator(
     """
     Ajoute un collaborateur à un tableau. Seul le propriétaire peut inviter de nouveaux collaborateurs.
     """
-    check_board_ownership(db, board_id, current_user.id)
+    role = _assignable_role(collaborator_data.role)
     
-    # Vérifier si l'utilisateur à inviter existe
-    user_to_add = db.query(User).filter(User.email == collaborator_data.email).first()
+    # Utilisateur invité et droit de propriété du demandeur en une seule requête
+    invited = select(User.id, User.username, User.email).where(
+        User.email == collaborator_data.email
+    ).cte("invited")
+    is_owner = exists().where(Board.id == board_id, Board.owner_id == current_user.id)
+    user_to_add = db.execute(
+        select(invited.c.id, invited.c.username, invited.c.email, is_owner.label("is_owner"))
+    ).first()
+    
+    # Aucune ligne : email inconnu, mais le refus d'accès reste prioritaire
     if not user_to_add:
+        _require_owner(db, board_id, current_user.id)
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Utilisateur non trouvé avec cet email"
         )
+    if not user_to_add.is_owner:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Seul le propriétaire peut effectuer cette action"
+        )
     
     # Empêcher l'auto-invitation
     if user_to_add.id == current_user.id:
@@ -208,29 +361,23 @@ def add_collaborator(
             detail="Vous ne pouvez pas vous ajouter en tant que collaborateur"
         )
     
-    # Vérifier si l'utilisateur est déjà collaborateur
-    existing_member = db.query(BoardMember).filter(
-        BoardMember.board_id == board_id,
-        BoardMember.user_id == user_to_add.id
-    ).first()
-    
-    if existing_member:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Cet utilisateur est déjà collaborateur de ce tableau"
-        )
-    
-    # Créer le nouveau membre
-    new_member = BoardMember(
-        board_id=board_id,
-        user_id=user_to_add.id,
-        role=collaborator_data.role
+    # Créer le nouveau membre en une seule instruction : un membre existant
+    # (conflit sur board_id, user_id) ne renvoie aucune ligne
+    stmt = (
+        pg_insert(BoardMember)
+        .values(board_id=board_id, user_id=user_to_add.id, role=role)
+        .on_conflict_do_nothing(index_elements=["board_id", "user_id"])
+        .returning(BoardMember.id, BoardMember.role, BoardMember.joined_at)
     )
     
     try:
-        db.add(new_member)
+        new_member = db.execute(stmt).first()
+        if new_member is None:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Cet utilisateur est déjà collaborateur de ce tableau"
+            )
         db.commit()
-        db.refresh(new_member)
         
         return CollaboratorOut(
             id=new_member.id,
@@ -248,6 +395,67 @@ def add_collaborator(
         )
 
 
+@router.post("/{board_id}/collaborators/bulk", response_model=List[CollaboratorOut])
+def add_collaborators_bulk(
+    board_id: int,
+    payload: CollaboratorBulkAdd,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """
+    Ajoute plusieurs collaborateurs à un tableau à partir d'une liste d'emails.
+    Seul le propriétaire peut inviter. Les emails inconnus, l'utilisateur courant
+    et les membres existants sont ignorés ; seuls les nouveaux membres sont renvoyés.
+    """
+    role = _assignable_role(payload.role)
+    _require_owner(db, board_id, current_user.id)
+    
+    # Tous les utilisateurs invités résolus en une seule requête
+    users = {
+        user.id: user
+        for user in db.execute(
+            select(User.id, User.username, User.email).where(User.email.in_(payload.emails))
+        )
+        if user.id != current_user.id
+    }
+    if not users:
+        return []
+    
+    # executemany avec RETURNING : regroupé par SQLAlchemy (insertmanyvalues)
+    # en INSERT ... VALUES (...), (...) par pages de insertmanyvalues_page_size
+    stmt = (
+        pg_insert(BoardMember)
+        .on_conflict_do_nothing(index_elements=["board_id", "user_id"])
+        .returning(BoardMember.id, BoardMember.user_id, BoardMember.role, BoardMember.joined_at)
+    )
+    values = [
+        {"board_id": board_id, "user_id": user_id, "role": role}
+        for user_id in users
+    ]
+    
+    try:
+        new_members = db.execute(stmt, values).all()
+        db.commit()
+    except IntegrityError:
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Erreur lors de l'ajout des collaborateurs"
+        )
+    
+    return [
+        CollaboratorOut(
+            id=member.id,
+            user_id=member.user_id,
+            username=users[member.user_id].username,
+            email=users[member.user_id].email,
+            role=member.role,
+            joined_at=member.joined_at
+        )
+        for member in new_members
+    ]
+
+
 @router.put("/{board_id}/collaborators/{user_id}", response_model=CollaboratorOut)
 def update_collaborator_role(
     board_id: int,
@@ -259,35 +467,23 @@ def update_collaborator_role(
     """
     Met à jour le rôle d'un collaborateur. Seul le propriétaire peut modifier les rôles.
     """
-    check_board_ownership(db, board_id, current_user.id)
+    role = _assignable_role(role_update.role)
+    _require_owner(db, board_id, current_user.id)
     
     # Vérifier que le collaborateur existe
-    collaborator = db.query(BoardMember).filter(
-        BoardMember.board_id == board_id,
-        BoardMember.user_id == user_id
-    ).first()
-    
-    if not collaborator:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Collaborateur non trouvé"
-        )
+    collaborator = _get_collaborator(db, board_id, user_id)
     
     # Empêcher la modification du rôle du propriétaire
-    board = db.query(Board).filter(Board.id == board_id).first()
-    if board.owner_id == user_id:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Impossible de modifier le rôle du propriétaire"
-        )
+    _protect_owner_row(collaborator, current_user.id, "Impossible de modifier le rôle du propriétaire")
     
-    collaborator.role = role_update.role
+    collaborator.role = role
     
     try:
         db.commit()
         db.refresh(collaborator)
         
-        user = db.query(User).filter(User.id == user_id).first()
+        # Session.get : identity map de la session (propre à la requête) avant tout SELECT
+        user = db.get(User, user_id)
         return CollaboratorOut(
             id=collaborator.id,
             user_id=user.id,
@@ -314,27 +510,13 @@ def remove_collaborator(
     """
     Retire un collaborateur d'un tableau. Seul le propriétaire peut retirer des collaborateurs.
     """
-    check_board_ownership(db, board_id, current_user.id)
+    _require_owner(db, board_id, current_user.id)
     
     # Vérifier que le collaborateur existe
-    collaborator = db.query(BoardMember).filter(
-        BoardMember.board_id == board_id,
-        BoardMember.user_id == user_id
-    ).first()
-    
-    if not collaborator:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Collaborateur non trouvé"
-        )
+    collaborator = _get_collaborator(db, board_id, user_id)
     
     # Empêcher le retrait du propriétaire
-    board = db.query(Board).filter(Board.id == board_id).first()
-    if board.owner_id == user_id:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Impossible de retirer le propriétaire du tableau"
-        )
+    _protect_owner_row(collaborator, current_user.id, "Impossible de retirer le propriétaire du tableau")
     
     try:
         db.delete(collaborator)
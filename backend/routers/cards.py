@@ -6,11 +6,12 @@ Endpoints API pour la gestion des cartes Kanban avec glisser-déposer, étiquett
 from typing import List, Optional
 from datetime import datetime, date
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, aliased, contains_eager, joinedload, raiseload, selectinload
+from sqlalchemy import and_, case, func, insert, or_, select, update
 
-from ..database import get_db
-from ..models import Card, CardLabel, Label, List, User
+from ..database import get_async_session, get_db
+from ..models import Board, Card, CardLabel, Label, List, User, board_members
 from ..schemas import (
     CardCreate, CardUpdate, CardResponse, 
     CardMove, LabelCreate, LabelResponse,
@@ -21,27 +22,84 @@ from ..auth import get_current_user
 router = APIRouter(prefix="/cards", tags=["cards"])
 
 
+def _is_member(board_id, user_id: int):
+    """
+    Condition de jointure sur board_members : le tableau `board_id` (colonne) est accessible
+    à l'utilisateur, propriétaire (ligne 'owner') ou collaborateur. La clé (board_id, user_id)
+    est unique : la jointure ne duplique aucune ligne.
+    """
+    return and_(board_members.c.board_id == board_id, board_members.c.user_id == user_id)
+
+
+def _load_card(
+    db: Session,
+    card_id: int,
+    user_id: int,
+    load_labels: bool = True,
+    detail: str = "Carte non trouvée ou non autorisée"
+) -> Card:
+    """
+    Charge une carte accessible à l'utilisateur en une seule requête : la liste et le
+    tableau de la jointure de contrôle sont réutilisés pour peupler card.list.board
+    (contains_eager), les étiquettes sont chargées par selectinload si demandées
+    (Card.labels est en raise_on_sql).
+    
+    Raises:
+        HTTPException 404: Si la carte n'existe pas ou n'est pas accessible
+    """
+    # raiseload("*") : toute autre relation lue à la sérialisation lève une erreur
+    # au lieu d'émettre un SELECT silencieux (N+1)
+    options = [contains_eager(Card.list).contains_eager(List.board), raiseload("*")]
+    if load_labels:
+        options.append(selectinload(Card.labels))
+    
+    card = db.query(Card).join(Card.list).join(List.board).join(
+        board_members, _is_member(Board.id, user_id)
+    ).filter(Card.id == card_id).options(*options).first()
+    
+    if not card:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=detail
+        )
+    return card
+
+
+def _next_position(db: Session, list_id: int) -> int:
+    """Position suivant la dernière carte de la liste (0 si la liste est vide)."""
+    return db.query(func.coalesce(func.max(Card.position), -1)).filter(
+        Card.list_id == list_id
+    ).scalar() + 1
+
+
 # ==================== CRUD DE BASE ====================
 
 @router.get("/", response_model=List[CardResponse])
-def get_cards(
+async def get_cards(
     list_id: Optional[int] = None,
     board_id: Optional[int] = None,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_session),
     current_user: User = Depends(get_current_user)
 ):
     """
     Récupère toutes les cartes de l'utilisateur connecté,
     filtrées optionnellement par list_id ou board_id
     """
-    query = db.query(Card).join(List).filter(List.board.has(user_id=current_user.id))
+    # Session asynchrone : la boucle d'événements reste libre pendant la requête ;
+    # liste et étiquettes chargées d'avance (aucun chargement paresseux possible en async)
+    stmt = (
+        select(Card)
+        .join(Card.list)
+        .join(board_members, _is_member(List.board_id, current_user.id))
+        .options(contains_eager(Card.list), selectinload(Card.labels), raiseload("*"))
+    )
     
     if list_id:
-        query = query.filter(Card.list_id == list_id)
+        stmt = stmt.where(Card.list_id == list_id)
     if board_id:
-        query = query.filter(List.board_id == board_id)
+        stmt = stmt.where(List.board_id == board_id)
     
-    return query.order_by(Card.position).all()
+    return (await db.scalars(stmt.order_by(Card.position))).all()
 
 
 @router.post("/", response_model=CardResponse, status_code=status.HTTP_201_CREATED)
@@ -54,10 +112,9 @@ def create_card(
     Crée une nouvelle carte dans une liste
     """
     # Vérifier que la liste appartient à l'utilisateur
-    list_obj = db.query(List).join(List.board).filter(
-        List.id == card_data.list_id,
-        List.board.has(user_id=current_user.id)
-    ).first()
+    list_obj = db.query(List).join(
+        board_members, _is_member(List.board_id, current_user.id)
+    ).filter(List.id == card_data.list_id).first()
     
     if not list_obj:
         raise HTTPException(
@@ -65,10 +122,8 @@ def create_card(
             detail="Liste non trouvée ou non autorisée"
         )
     
-    # Calculer la position (ajouter à la fin)
-    max_position = db.query(Card).filter(
-        Card.list_id == card_data.list_id
-    ).count()
+    # Calculer la position (ajouter à la fin) : MAX lu en fin d'index (list_id, position)
+    max_position = _next_position(db, card_data.list_id)
     
     new_card = Card(
         **card_data.dict(exclude={"labels", "due_date"}),
@@ -79,20 +134,23 @@ def create_card(
     db.add(new_card)
     db.flush()  # Pour obtenir l'ID de la nouvelle carte
     
-    # Gérer les étiquettes si fournies
+    # Gérer les étiquettes si fournies : étiquettes autorisées validées en une requête,
+    # associations insérées en un seul executemany
     if card_data.labels:
-        for label_id in card_data.labels:
-            label = db.query(Label).join(Label.board).filter(
-                Label.id == label_id,
-                Label.board.has(user_id=current_user.id)
-            ).first()
-            if label:
-                card_label = CardLabel(card_id=new_card.id, label_id=label_id)
-                db.add(card_label)
+        valid_ids = db.scalars(
+            select(Label.id)
+            .join(board_members, _is_member(Label.board_id, current_user.id))
+            .where(Label.id.in_(card_data.labels))
+        ).all()
+        if valid_ids:
+            db.execute(
+                insert(CardLabel),
+                [{"card_id": new_card.id, "label_id": label_id} for label_id in valid_ids]
+            )
     
     db.commit()
-    db.refresh(new_card)
-    return new_card
+    # Relue par _load_card : refresh() laisserait Card.labels (raise_on_sql) non chargée
+    return _load_card(db, new_card.id, current_user.id)
 
 
 @router.get("/{card_id}", response_model=CardResponse)
@@ -104,16 +162,7 @@ def get_card(
     """
     Récupère une carte spécifique par son ID
     """
-    card = db.query(Card).join(Card.list).join(List.board).filter(
-        Card.id == card_id,
-        List.board.has(user_id=current_user.id)
-    ).first()
-    
-    if not card:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Carte non trouvée"
-        )
+    card = _load_card(db, card_id, current_user.id, detail="Carte non trouvée")
     
     return card
 
@@ -128,24 +177,15 @@ def update_card(
     """
     Met à jour les informations d'une carte (titre, description, etc.)
     """
-    card = db.query(Card).join(Card.list).join(List.board).filter(
-        Card.id == card_id,
-        List.board.has(user_id=current_user.id)
-    ).first()
-    
-    if not card:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Carte non trouvée ou non autorisée"
-        )
+    card = _load_card(db, card_id, current_user.id)
     
     # Mettre à jour les champs
     for field, value in card_data.dict(exclude_unset=True, exclude={"labels"}).items():
         setattr(card, field, value)
     
     db.commit()
-    db.refresh(card)
-    return card
+    # Rechargée par _load_card : refresh() laisserait Card.labels (raise_on_sql) non chargée
+    return _load_card(db, card_id, current_user.id)
 
 
 @router.delete("/{card_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -157,16 +197,7 @@ def delete_card(
     """
     Supprime une carte et ses dépendances (étiquettes, pièces jointes, etc.)
     """
-    card = db.query(Card).join(Card.list).join(List.board).filter(
-        Card.id == card_id,
-        List.board.has(user_id=current_user.id)
-    ).first()
-    
-    if not card:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Carte non trouvée ou non autorisée"
-        )
+    card = _load_card(db, card_id, current_user.id, load_labels=False)
     
     # Supprimer les relations CardLabel
     db.query(CardLabel).filter(CardLabel.card_id == card_id).delete()
@@ -190,24 +221,32 @@ def move_card(
     """
     Déplace une carte entre listes et/ou change sa position (glisser-déposer)
     """
-    card = db.query(Card).join(Card.list).join(List.board).filter(
-        Card.id == card_id,
-        List.board.has(user_id=current_user.id)
-    ).first()
-    
-    if not card:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Carte non trouvée ou non autorisée"
+    # Carte et liste de destination vérifiées en une seule requête : la carte est jointe à sa
+    # liste, son tableau et l'appartenance de l'utilisateur, la liste cible (alias) à
+    # l'appartenance de l'utilisateur à son propre tableau
+    target_list = aliased(List, name="target_list")
+    target_member = board_members.alias("target_member")
+    card = db.execute(
+        select(Card)
+        .join(Card.list)
+        .join(List.board)
+        .join(board_members, _is_member(Board.id, current_user.id))
+        .join(target_list, target_list.id == move_data.target_list_id)
+        .join(
+            target_member,
+            and_(
+                target_member.c.board_id == target_list.board_id,
+                target_member.c.user_id == current_user.id
+            )
         )
-    
-    # Vérifier que la liste de destination existe et appartient à l'utilisateur
-    target_list = db.query(List).join(List.board).filter(
-        List.id == move_data.target_list_id,
-        List.board.has(user_id=current_user.id)
-    ).first()
-    
-    if not target_list:
+        .where(Card.id == card_id)
+        .options(contains_eager(Card.list).contains_eager(List.board), raiseload("*"))
+    ).scalar_one_or_none()
+    
+    if card is None:
+        # Cas d'erreur uniquement : distinguer carte introuvable (404 levée par
+        # _load_card) et liste de destination introuvable
+        _load_card(db, card_id, current_user.id, load_labels=False)
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Liste de destination non trouvée"
@@ -221,64 +260,72 @@ def move_card(
         # Déplacer vers une autre liste
         _move_card_to_new_list(db, card, move_data.target_list_id, move_data.position)
     
+    # UPDATE exécutés hors ORM (synchronize_session=False) : la carte est relue après le commit
     db.commit()
-    db.refresh(card)
-    return card
+    # Rechargée par _load_card : refresh() laisserait Card.labels (raise_on_sql) non chargée
+    return _load_card(db, card_id, current_user.id)
 
 
 def _reorder_cards_same_list(db: Session, card: Card, new_position: int):
-    """Réorganise les positions des cartes dans la même liste"""
+    """
+    Réorganise les positions des cartes dans la même liste en un seul UPDATE :
+    la carte déplacée prend sa nouvelle position, les cartes intermédiaires sont
+    décalées d'un rang (CASE évalué par la base sur les valeurs avant mise à jour).
+    """
     old_position = card.position
     
     if new_position == old_position:
         return
     
     if new_position < old_position:
-        # Déplacer vers le haut
-        db.query(Card).filter(
-            Card.list_id == card.list_id,
-            Card.position >= new_position,
-            Card.position < old_position
-        ).update({"position": Card.position + 1})
+        # Déplacer vers le haut : les cartes [new, old[ descendent d'un rang
+        shifted = Card.position.between(new_position, old_position - 1)
+        delta = 1
     else:
-        # Déplacer vers le bas
-        db.query(Card).filter(
-            Card.list_id == card.list_id,
-            Card.position > old_position,
-            Card.position <= new_position
-        ).update({"position": Card.position - 1})
-    
-    card.position = new_position
+        # Déplacer vers le bas : les cartes ]old, new] remontent d'un rang
+        shifted = Card.position.between(old_position + 1, new_position)
+        delta = -1
+    
+    db.execute(
+        update(Card)
+        .where(Card.list_id == card.list_id, or_(Card.id == card.id, shifted))
+        .values(position=case((Card.id == card.id, new_position), else_=Card.position + delta))
+        .execution_options(synchronize_session=False)
+    )
 
 
 def _move_card_to_new_list(db: Session, card: Card, target_list_id: int, new_position: int):
-    """Déplace une carte vers une nouvelle liste et réorganise les positions"""
+    """
+    Déplace une carte vers une nouvelle liste en un seul UPDATE : fermeture du trou
+    dans l'ancienne liste, place libérée dans la nouvelle et déplacement de la carte.
+    """
     old_list_id = card.list_id
     old_position = card.position
     
-    # Retirer la carte de l'ancienne liste (décaler les positions)
-    db.query(Card).filter(
-        Card.list_id == old_list_id,
-        Card.position > old_position
-    ).update({"position": Card.position - 1})
-    
     # Ajuster la position dans la nouvelle liste
-    max_position = db.query(Card).filter(
-        Card.list_id == target_list_id
-    ).count()
+    max_position = _next_position(db, target_list_id)
     
     if new_position is None or new_position > max_position:
         new_position = max_position
     
-    # Faire de la place dans la nouvelle liste
-    db.query(Card).filter(
-        Card.list_id == target_list_id,
-        Card.position >= new_position
-    ).update({"position": Card.position + 1})
-    
-    # Mettre à jour la carte
-    card.list_id = target_list_id
-    card.position = new_position
+    # Les CASE lisent les valeurs d'avant la mise à jour (list_id compris)
+    db.execute(
+        update(Card)
+        .where(or_(
+            Card.id == card.id,
+            and_(Card.list_id == old_list_id, Card.position > old_position),
+            and_(Card.list_id == target_list_id, Card.position >= new_position)
+        ))
+        .values(
+            position=case(
+                (Card.id == card.id, new_position),
+                (Card.list_id == old_list_id, Card.position - 1),
+                else_=Card.position + 1
+            ),
+            list_id=case((Card.id == card.id, target_list_id), else_=Card.list_id)
+        )
+        .execution_options(synchronize_session=False)
+    )
 
 
 # ==================== ÉTIQUETTES ====================
@@ -292,16 +339,7 @@ def get_card_labels(
     """
     Récupère toutes les étiquettes associées à une carte
     """
-    card = db.query(Card).join(Card.list).join(List.board).filter(
-        Card.id == card_id,
-        List.board.has(user_id=current_user.id)
-    ).first()
-    
-    if not card:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Carte non trouvée ou non autorisée"
-        )
+    card = _load_card(db, card_id, current_user.id)
     
     return card.labels
 
@@ -317,26 +355,12 @@ def add_label_to_card(
     Ajoute une étiquette existante à une carte,
     ou crée une nouvelle étiquette si label_id est None
     """
-    card = db.query(Card).join(Card.list).join(List.board).filter(
-        Card.id == card_id,
-        List.board.has(user_id=current_user.id)
-    ).first()
-    
-    if not card:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Carte non trouvée ou non autorisée"
-        )
+    card = _load_card(db, card_id, current_user.id, load_labels=False)
     
     # Si on crée une nouvelle étiquette
     if label_data.label_id is None:
-        # Vérifier que le board existe et appartient à l'utilisateur
+        # Tableau de la carte, déjà contrôlé (board_members) et chargé par _load_card
         board = card.list.board
-        if board.user_id != current_user.id:
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="Non autorisé à créer des étiquettes pour ce board"
-            )
         
         new_label = Label(
             name=label_data.name,
@@ -345,20 +369,19 @@ def add_label_to_card(
         )
         db.add(new_label)
         db.flush()
-        label_id = new_label.id
+        resolved_label = new_label
     else:
         # Utiliser une étiquette existante
-        label_id = label_data.label_id
-        label = db.query(Label).join(Label.board).filter(
-            Label.id == label_id,
-            Label.board.has(user_id=current_user.id)
-        ).first()
+        resolved_label = db.query(Label).join(
+            board_members, _is_member(Label.board_id, current_user.id)
+        ).filter(Label.id == label_data.label_id).first()
         
-        if not label:
+        if not resolved_label:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Étiquette non trouvée ou non autorisée"
             )
+    label_id = resolved_label.id
     
     # Vérifier que l'étiquette n'est pas déjà associée
     existing = db.query(CardLabel).filter(
@@ -375,9 +398,12 @@ def add_label_to_card(
     # Ajouter l'étiquette à la carte
     card_label = CardLabel(card_id=card_id, label_id=label_id)
     db.add(card_label)
+    # Étiquette déjà en session (créée ou lue plus haut) : sérialisée avant le commit,
+    # qui expirerait ses attributs, plutôt que relue par un nouveau SELECT
+    response = LabelResponse.model_validate(resolved_label)
     db.commit()
     
-    return db.query(Label).get(label_id)
+    return response
 
 
 @router.delete("/{card_id}/labels/{label_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -390,16 +416,7 @@ def remove_label_from_card(
     """
     Supprime une étiquette d'une carte
     """
-    card = db.query(Card).join(Card.list).join(List.board).filter(
-        Card.id == card_id,
-        List.board.has(user_id=current_user.id)
-    ).first()
-    
-    if not card:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Carte non trouvée ou non autorisée"
-        )
+    card = _load_card(db, card_id, current_user.id, load_labels=False)
     
     card_label = db.query(CardLabel).filter(
         CardLabel.card_id == card_id,
@@ -430,16 +447,7 @@ def set_due_date(
     """
     Définit ou met à jour la date d'échéance d'une carte
     """
-    card = db.query(Card).join(Card.list).join(List.board).filter(
-        Card.id == card_id,
-        List.board.has(user_id=current_user.id)
-    ).first()
-    
-    if not card:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Carte non trouvée ou non autorisée"
-        )
+    card = _load_card(db, card_id, current_user.id)
     
     # Valider que la date n'est pas dans le passé (optionnel, peut être désactivé)
     if due_date_data.due_date and due_date_data.due_date < date.today():
@@ -450,8 +458,8 @@ def set_due_date(
     
     card.due_date = due_date_data.due_date
     db.commit()
-    db.refresh(card)
-    return card
+    # Rechargée par _load_card : refresh() laisserait Card.labels (raise_on_sql) non chargée
+    return _load_card(db, card_id, current_user.id)
 
 
 @router.delete("/{card_id}/due-date", status_code=status.HTTP_204_NO_CONTENT)
@@ -463,16 +471,7 @@ def remove_due_date(
     """
     Supprime la date d'échéance d'une carte
     """
-    card = db.query(Card).join(Card.list).join(List.board).filter(
-        Card.id == card_id,
-        List.board.has(user_id=current_user.id)
-    ).first()
-    
-    if not card:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Carte non trouvée ou non autorisée"
-        )
+    card = _load_card(db, card_id, current_user.id, load_labels=False)
     
     card.due_date = None
     db.commit()
@@ -483,34 +482,40 @@ def remove_due_date(
 # ==================== RECHERCHE & FILTRES ====================
 
 @router.get("/filter/by-label/{label_id}", response_model=List[CardResponse])
-def get_cards_by_label(
+async def get_cards_by_label(
     label_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_session),
     current_user: User = Depends(get_current_user)
 ):
     """
     Récupère toutes les cartes ayant une étiquette spécifique
     """
     # Vérifier que l'étiquette existe et appartient à l'utilisateur
-    label = db.query(Label).join(Label.board).filter(
-        Label.id == label_id,
-        Label.board.has(user_id=current_user.id)
-    ).first()
+    label_id_found = await db.scalar(
+        select(Label.id)
+        .join(board_members, _is_member(Label.board_id, current_user.id))
+        .where(Label.id == label_id)
+    )
     
-    if not label:
+    if label_id_found is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Étiquette non trouvée ou non autorisée"
         )
     
-    return db.query(Card).join(Card.labels).filter(
-        Label.id == label_id
-    ).order_by(Card.due_date, Card.position).all()
+    stmt = (
+        select(Card)
+        .join(Card.labels)
+        .where(Label.id == label_id)
+        .options(joinedload(Card.list), selectinload(Card.labels), raiseload("*"))
+        .order_by(Card.due_date, Card.position)
+    )
+    return (await db.scalars(stmt)).all()
 
 
 @router.get("/filter/overdue", response_model=List[CardResponse])
-def get_overdue_cards(
-    db: Session = Depends(get_db),
+async def get_overdue_cards(
+    db: AsyncSession = Depends(get_async_session),
     current_user: User = Depends(get_current_user)
 ):
     """
@@ -518,16 +523,23 @@ def get_overdue_cards(
     """
     today = date.today()
     
-    return db.query(Card).join(Card.list).join(List.board).filter(
-        List.board.has(user_id=current_user.id),
-        Card.due_date.isnot(None),
-        Card.due_date < today
-    ).order_by(Card.due_date).all()
+    stmt = (
+        select(Card)
+        .join(Card.list)
+        .join(board_members, _is_member(List.board_id, current_user.id))
+        .where(
+            Card.due_date.isnot(None),
+            Card.due_date < today
+        )
+        .options(contains_eager(Card.list), selectinload(Card.labels), raiseload("*"))
+        .order_by(Card.due_date)
+    )
+    return (await db.scalars(stmt)).all()
 
 
 @router.get("/filter/due-this-week", response_model=List[CardResponse])
-def get_cards_due_this_week(
-    db: Session = Depends(get_db),
+async def get_cards_due_this_week(
+    db: AsyncSession = Depends(get_async_session),
     current_user: User = Depends(get_current_user)
 ):
     """
@@ -536,9 +548,16 @@ def get_cards_due_this_week(
     today = date.today()
     week_end = date.fromordinal(today.toordinal() + 7)
     
-    return db.query(Card).join(Card.list).join(List.board).filter(
-        List.board.has(user_id=current_user.id),
-        Card.due_date.isnot(None),
-        Card.due_date >= today,
-        Card.due_date <= week_end
-    ).order_by(Card.due_date).all()
\ No newline at end of file
+    stmt = (
+        select(Card)
+        .join(Card.list)
+        .join(board_members, _is_member(List.board_id, current_user.id))
+        .where(
+            Card.due_date.isnot(None),
+            Card.due_date >= today,
+            Card.due_date <= week_end
+        )
+        .options(contains_eager(Card.list), selectinload(Card.labels), raiseload("*"))
+        .order_by(Card.due_date)
+    )
+    return (await db.scalars(stmt)).all()
@@ -3,7 +3,7 @@ Endpoints API pour la gestion des étiquettes (labels)
 Permet les opérations CRUD sur les étiquettes utilisables pour catégoriser les images
 """
 from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Response, status
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError
 
@@ -27,15 +27,29 @@ router = APIRouter(
     description="Retourne la liste de toutes les étiquettes disponibles"
 )
 async def get_labels(
+    response: Response,
+    after_id: Optional[int] = None,
     skip: int = 0,
     limit: int = 100,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
 ):
     """
-    Récupère les étiquettes avec pagination
+    Récupère les étiquettes avec pagination par curseur (keyset) : after_id est
+    l'identifiant de la dernière étiquette de la page précédente, renvoyé dans
+    l'en-tête X-Next-Cursor quand une page suivante peut exister.
+    skip (OFFSET) reste accepté pour les clients existants.
     """
-    labels = db.query(Label).offset(skip).limit(limit).all()
+    query = db.query(Label).order_by(Label.id)
+    if after_id is not None:
+        # Parcours de la clé primaire à partir du curseur : coût O(limit) quelle que soit la page
+        query = query.filter(Label.id > after_id)
+    elif skip:
+        query = query.offset(skip)
+    labels = query.limit(limit).all()
+    
+    if labels and len(labels) == limit:
+        response.headers["X-Next-Cursor"] = str(labels[-1].id)
     return labels
 
 
@@ -53,7 +67,7 @@ async def get_label(
     """
     Récupère une étiquette par son identifiant
     """
-    label = db.query(Label).filter(Label.id == label_id).first()
+    label = db.get(Label, label_id)
     if not label:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -114,7 +128,7 @@ async def update_label(
     """
     Met à jour une étiquette existante
     """
-    db_label = db.query(Label).filter(Label.id == label_id).first()
+    db_label = db.get(Label, label_id)
     if not db_label:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -163,7 +177,7 @@ async def delete_label(
     """
     Supprime une étiquette
     """
-    db_label = db.query(Label).filter(Label.id == label_id).first()
+    db_label = db.get(Label, label_id)
     if not db_label:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -26,6 +26,11 @@ class ProductStatusEnum(str, Enum):
     INACTIVE = "inactive"
     DRAFT = "draft"
 
+class CollaboratorRoleEnum(str, Enum):
+    """Rôles attribuables à un collaborateur (la propriété d'un tableau ne se délègue pas)"""
+    ADMIN = "admin"
+    MEMBER = "member"
+
 # ============================================================================
 # MIXINS (champs communs)
 # ============================================================================
@@ -182,6 +187,15 @@ class ValidationErrorResponse(ErrorResponse):
     error_code: str = "VALIDATION_ERROR"
     errors: List[dict] = Field(description="Liste des erreurs de validation")
 
+# ============================================================================
+# COLLABORATEURS
+# ============================================================================
+
+class CollaboratorBulkAdd(BaseModel):
+    """Schéma pour l'invitation groupée de collaborateurs sur un tableau"""
+    emails: List[EmailStr] = Field(..., min_length=1, max_length=100)
+    role: CollaboratorRoleEnum = CollaboratorRoleEnum.MEMBER
+
 # ============================================================================
 # HEALTH CHECK
 # ============================================================================
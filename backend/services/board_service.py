@@ -67,7 +67,7 @@ class BoardService:
         
         if not board_member:
             # Vérifier si le tableau existe
-            board = db.query(Board).filter(Board.id == board_id).first()
+            board = db.get(Board, board_id)
             if not board:
                 raise ResourceNotFoundError(f"Tableau {board_id} non trouvé")
             raise PermissionDeniedError(
@@ -103,7 +103,7 @@ class BoardService:
         Returns:
             Board: Le tableau créé
         """
-        user = db.query(User).filter(User.id == user_id).first()
+        user = db.get(User, user_id)
         if not user:
             raise ResourceNotFoundError(f"Utilisateur {user_id} non trouvé")
         
@@ -149,7 +149,7 @@ class BoardService:
         Raises:
             PermissionDeniedError: Si accès refusé
         """
-        board = db.query(Board).filter(Board.id == board_id).first()
+        board = db.get(Board, board_id)
         if not board:
             raise ResourceNotFoundError(f"Tableau {board_id} non trouvé")
         
@@ -213,7 +213,7 @@ class BoardService:
         BoardService._check_permission(db, board_id, user_id, 'update')
         
         # Récupérer et mettre à jour
-        board = db.query(Board).filter(Board.id == board_id).first()
+        board = db.get(Board, board_id)
         if not board:
             raise ResourceNotFoundError(f"Tableau {board_id} non trouvé")
         
@@ -246,7 +246,7 @@ class BoardService:
         # Vérifier permissions (seul owner peut supprimer)
         BoardService._check_permission(db, board_id, user_id, 'delete')
         
-        board = db.query(Board).filter(Board.id == board_id).first()
+        board = db.get(Board, board_id)
         if not board:
             raise ResourceNotFoundError(f"Tableau {board_id} non trouvé")
         
@@ -278,7 +278,7 @@ class BoardService:
         BoardService._check_permission(db, board_id, current_user_id, 'manage_members')
         
         # Vérifier que l'utilisateur cible existe
-        target_user = db.query(User).filter(User.id == target_user_id).first()
+        target_user = db.get(User, target_user_id)
         if not target_user:
             raise ResourceNotFoundError(f"Utilisateur cible {target_user_id} non trouvé")
         
@@ -68,7 +68,7 @@ class CardService:
     ) -> None:
         """Envoie des notifications liées aux actions sur les cartes"""
         try:
-            user = self.db.query(User).filter(User.id == user_id).first()
+            user = self.db.get(User, user_id)
             if not user:
                 return
             
@@ -186,7 +186,7 @@ class CardService:
     ) -> List[Card]:
         """Récupère toutes les cartes d'un board avec filtres optionnels"""
         # Vérification d'accès au board
-        board = self.db.query(Board).filter(Board.id == board_id).first()
+        board = self.db.get(Board, board_id)
         if not board:
             raise BoardNotFoundException(f"Board avec l'ID {board_id} non trouvé")
         
@@ -469,7 +469,7 @@ class CardService:
         """Assigne un utilisateur à une carte"""
         card = self.get_card_by_id(card_id, assigned_by_user_id)
         
-        assignee = self.db.query(User).filter(User.id == assignee_id).first()
+        assignee = self.db.get(User, assignee_id)
         if not assignee:
             raise ValueError(f"Utilisateur {assignee_id} non trouvé")
         
@@ -528,7 +528,7 @@ class CardService:
         # Retirer les assignés supprimés
         for current_id in current_assignee_ids:
             if current_id not in new_assignee_ids:
-                user_to_remove = self.db.query(User).filter(User.id == current_id).first()
+                user_to_remove = self.db.get(User, current_id)
                 if user_to_remove:
                     card.assignees.remove(user_to_remove)
                     